@@ -5,20 +5,29 @@ Contrôleur pour l’analyse des systèmes dynamiques linéaires :
 - Calcul des pôles
 - Vérification de la stabilité
 - Analyse de la contrôlabilité et de l’observabilité
+- Criblage de stabilité d'une famille de systèmes
 """
 
-from modules.system_analysis import StateSpaceSystem
+from modules.system_analysis import StateSpaceSystem, screen_stability
 
 
-def analyze_system(A, B, C, D):
+def analyze_system(A, B, C, D, impulse_points=None, frequency_points=500):
     """
     Analyse un système à partir de ses matrices (A, B, C, D)
 
-    
+    Les entrées du dictionnaire retourné (pôles, stabilité, réponses
+    impulsionnelle et fréquentielle) ne sont calculées qu'à leur lecture.
     """
-    system = StateSpaceSystem(A, B, C, D)
+    system = StateSpaceSystem(A, B, C, D, impulse_points=impulse_points, frequency_points=frequency_points)
     
     return system.analysis
-   
-   
-    
+
+
+def screen_systems(A_family, chunk_size=4096):
+    """
+    Crible la stabilité d'une famille de matrices A (pile (N, n, n) ou générateur)
+
+    Returns:
+        tableau structuré avec les champs stable, spectral_abscissa, min_damping, damping
+    """
+    return screen_stability(A_family, chunk_size=chunk_size)
@@ -1,6 +1,5 @@
 from modules.controllability import ControlObservabilityAnalyzer
 import numpy as np
-from numpy.linalg import matrix_rank
 
     
    
@@ -13,11 +12,9 @@ def control_observ(A, B, C, D):
     """
     obj = ControlObservabilityAnalyzer(A,B,C,D)
     
-    Wc = obj.controllability_matrix()
-    rang_Wc = matrix_rank(Wc)
+    rang_Wc = obj.controllability_rank()
     
-    Wo = obj.observability_matrix()
-    rang_Wo = matrix_rank(Wo)
+    rang_Wo = obj.observability_rank()
     
     conclusion = obj.summary()
     
@@ -5,11 +5,15 @@ Contrôleur pour les systèmes non linéaires :
 - Simulation
 - Linéarisation autour d’un point
 - Vérification de fonction de Lyapunov
+- Simulation d'un ensemble de conditions initiales
+- Vérification numérique d'une fonction de Lyapunov sur une région
+- Recherche automatique des points d'équilibre
 """
 
+import numpy as np
 from modules.nonlinear_analysis import NonlinearSystem
 
-def analyze_nonlinear_system(state_vars, dynamics_exprs, x0, t_span, eq_point, V_expr):
+def analyze_nonlinear_system(state_vars, dynamics_exprs, x0, t_span, eq_point, V_expr, equilibrium_bounds=None):
     """
     Analyse un système non linéaire
 
@@ -18,7 +22,7 @@ def analyze_nonlinear_system(state_vars, dynamics_exprs, x0, t_span, eq_point, V
         dynamics_exprs : équations dynamiques symboliques
         x0 : état initial
         t_span : intervalle de temps
-        eq_point : point d’équilibre
+        eq_point : point d’équilibre (None : recherché automatiquement dans equilibrium_bounds)
         V_expr : fonction de Lyapunov symbolique (ex: "x1**2 + x2**2")
 
     Returns:
@@ -26,9 +30,19 @@ def analyze_nonlinear_system(state_vars, dynamics_exprs, x0, t_span, eq_point, V
             - solution temporelle
             - Jacobienne
             - V(x) et dV/dt
+            - points d'équilibre trouvés (si eq_point est None)
     """
     sys = NonlinearSystem(state_vars, dynamics_exprs)
     t, y = sys.simulate(x0, t_span)
+    equilibria = None
+    if eq_point is None:
+        if equilibrium_bounds is None:
+            equilibrium_bounds = [(-10, 10)] * len(state_vars)
+        equilibria = sys.find_equilibria(equilibrium_bounds)
+        if not equilibria:
+            raise ValueError("Aucun point d'équilibre trouvé dans la région de recherche.")
+        # Le point le plus proche de l'état initial est retenu pour la linéarisation
+        eq_point = min(equilibria, key=lambda e: np.linalg.norm(e["point"] - np.asarray(x0, dtype=float)))["point"]
     J = sys.linearize_at(eq_point)
     V, dVdt = sys.check_lyapunov_function(V_expr)
 
@@ -36,6 +50,73 @@ def analyze_nonlinear_system(state_vars, dynamics_exprs, x0, t_span, eq_point, V
         "t": t,
         "states": y,
         "jacobian": J,
+        "eq_point": eq_point,
+        "equilibria": equilibria,
         "lyapunov_V": V,
         "dVdt": dVdt
     }
+
+
+def simulate_nonlinear_ensemble(state_vars, dynamics_exprs, X0, t_span, method="RK45", n_jobs=1,
+                                rtol=1e-3, atol=1e-6):
+    """
+    Simule un système non linéaire depuis un lot de conditions initiales
+
+    Args:
+        state_vars : liste de symboles sympy
+        dynamics_exprs : équations dynamiques symboliques
+        X0 : tableau (N, n) des états initiaux
+        t_span : intervalle de temps
+        method : méthode d'intégration de solve_ivp
+        n_jobs : nombre de processus (1 : une seule intégration empilée, None : un par cœur)
+        rtol, atol : tolérances visées pour chaque trajectoire
+
+    Returns:
+        dict contenant :
+            - t : instants
+            - states : trajectoires (N, n, T)
+    """
+    sys = NonlinearSystem(state_vars, dynamics_exprs)
+    t, Y = sys.simulate_ensemble(X0, t_span, method=method, n_jobs=n_jobs, rtol=rtol, atol=atol)
+
+    return {
+        "t": t,
+        "states": Y
+    }
+
+
+def verify_lyapunov_function(state_vars, dynamics_exprs, V_expr, bounds, sampling="grid", resolution=101):
+    """
+    Vérifie numériquement dV/dt < 0 (et V > 0) sur une boîte de l'espace d'état
+
+    Args:
+        state_vars : liste de symboles sympy
+        dynamics_exprs : équations dynamiques symboliques
+        V_expr : fonction de Lyapunov candidate
+        bounds : liste de couples (min, max), un par variable d'état
+        sampling : "grid" ou "sobol"
+        resolution : nombre de points par axe pour la grille
+
+    Returns:
+        dict contenant le nombre de violations, le pire point, le plus grand
+        sous-niveau certifié de V (0 si aucun) et le verdict certified
+    """
+    sys = NonlinearSystem(state_vars, dynamics_exprs)
+    return sys.verify_lyapunov(V_expr, bounds, sampling=sampling, resolution=resolution)
+
+
+def find_equilibrium_points(state_vars, dynamics_exprs, bounds, n_starts=256):
+    """
+    Recherche et classe les points d'équilibre d'un système non linéaire
+
+    Args:
+        state_vars : liste de symboles sympy
+        dynamics_exprs : équations dynamiques symboliques
+        bounds : liste de couples (min, max), un par variable d'état
+        n_starts : nombre de points de départ résolus en parallèle
+
+    Returns:
+        liste de dicts (point, valeurs propres, type, stabilité)
+    """
+    sys = NonlinearSystem(state_vars, dynamics_exprs)
+    return sys.find_equilibria(bounds, n_starts=n_starts)
@@ -4,6 +4,9 @@
 Contrôleur pour la commande par sortie observée :
 - Calcul des gains K et L
 - Simulation du système avec estimation d’état
+- Simulation par lot de couples (x0, x̂0)
+- Simulation en coordonnées d’erreur d’estimation
+- Calcul des gains L par lot
 """
 
 from modules.output_feedback import OutputFeedbackSystem
@@ -36,3 +39,83 @@ def simulate_output_feedback(A, B, C, K, observer_poles, x0, xhat0, t_span):
         "x": x,
         "x_hat": xhat
     }
+
+
+def simulate_output_feedback_batch(A, B, C, K, observer_poles, X0, Xhat0, t_span):
+    """
+    Simule le système avec observateur pour un lot de couples (x0, x̂0)
+
+    Args:
+        A, B, C : matrices du système
+        K : gain de feedback état
+        observer_poles : pôles souhaités pour l’observateur
+        X0, Xhat0 : tableaux (N, n) des états initiaux réels et estimés
+        t_span : tuple (t0, tf)
+
+    Returns:
+        dict contenant :
+            - gain L
+            - temps, états réels et estimés (N, n, T)
+    """
+    sys = OutputFeedbackSystem(A, B, C)
+    sys.set_state_feedback_gain(K)
+    L = sys.compute_observer_gain(observer_poles)
+    t, x, xhat = sys.simulate_output_feedback_batch(X0, Xhat0, t_span)
+
+    return {
+        "L": L,
+        "t": t,
+        "x": x,
+        "x_hat": xhat
+    }
+
+
+def simulate_estimation_error(A, B, C, K, observer_poles, x0, xhat0, t_span):
+    """
+    Simule le système avec observateur en coordonnées (x, e = x - x̂)
+
+    Args:
+        A, B, C : matrices du système
+        K : gain de feedback état
+        observer_poles : pôles souhaités pour l’observateur
+        x0, xhat0 : états initiaux (n,) ou lots (N, n)
+        t_span : tuple (t0, tf)
+
+    Returns:
+        dict contenant :
+            - gain L
+            - temps, états réels, estimés et erreur d’estimation
+            - indicateurs de convergence de l’erreur
+    """
+    sys = OutputFeedbackSystem(A, B, C)
+    sys.set_state_feedback_gain(K)
+    L = sys.compute_observer_gain(observer_poles)
+    t, x, xhat, e = sys.simulate_estimation_error(x0, xhat0, t_span)
+
+    return {
+        "L": L,
+        "t": t,
+        "x": x,
+        "x_hat": xhat,
+        "error": e,
+        "metrics": sys.estimation_error_metrics(t, e)
+    }
+
+
+def compute_observer_gains_batch(A, B, C, poles_batch, n_jobs=1):
+    """
+    Calcule les gains d’observateur L pour un lot de jeux de pôles
+
+    Args:
+        A, B, C : matrices du système
+        poles_batch : tableau (N, n) de jeux de pôles de l’observateur
+        n_jobs : nombre de processus (cas multi-sorties)
+
+    Returns:
+        dict contenant :
+            - gains L empilés (N, n, p)
+            - indicateurs par jeu de pôles (conditionnement, norme du gain, erreur de placement,
+              méthode utilisée, message d'erreur si le placement a échoué)
+    """
+    sys = OutputFeedbackSystem(A, B, C)
+    return sys.compute_observer_gain_batch(poles_batch, n_jobs=n_jobs)
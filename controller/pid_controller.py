@@ -2,10 +2,15 @@
 Contrôleur pour la régulation PID :
 - Définition d’un système par fonction de transfert
 - Application d’un PID
-- Calculs : réponse temporelle, erreur, Bode, pôles
+- Calculs : réponse temporelle, erreur, Bode, pôles, marges de stabilité
+- Balayage de gains en parallèle
+- Critère de Nyquist (verdict de stabilité, distance à -1)
+- Réglage automatique des gains
+- PID discret et simulation échantillonnée
 """
 
-from modules.pid_design import PIDModel
+import numpy as np
+from modules.pid_design import PIDModel, sweep_pid_gains, pid_nyquist_batch
 
 def simulate_pid(num, den, Kp, Ki, Kd):
     """
@@ -22,6 +27,7 @@ def simulate_pid(num, den, Kp, Ki, Kd):
             - omega, magnitude, phase : données pour Bode
             - system_open_loop : FT PID * FT du système
             - poles : pôles de la FT en boucle ouverte
+            - margins : marges de gain, de phase, de retard et pic de sensibilité
     """
     sys = PIDModel(num, den)
     sys.set_pid_gains(Kp, Ki, Kd)
@@ -36,7 +42,7 @@ def simulate_pid(num, den, Kp, Ki, Kd):
     omega, mag, phase = sys.bode_plot_data()
 
     # Fonction de transfert en boucle ouverte
-    system_open_loop = sys.pid * sys.sys
+    system_open_loop = sys.open_loop
 
     return {
         "t": t,
@@ -47,5 +53,126 @@ def simulate_pid(num, den, Kp, Ki, Kd):
         "magnitude": mag,
         "phase": phase,
         "system_open_loop": system_open_loop,
-        "poles": system_open_loop.poles()
+        "poles": sys.poles(),
+        "margins": sys.stability_margins()
     }
+
+
+def sweep_pid(num, den, Kp, Ki, Kd, grid=True, n_jobs=None, keep_best=0, objective="IAE"):
+    """
+    Évalue un ensemble de gains PID en parallèle
+
+    Args:
+        num, den : numérateur et dénominateur de la FT
+        Kp, Ki, Kd : valeurs des gains (grille si grid=True, échantillons sinon)
+        n_jobs : nombre de processus
+        keep_best : nombre de meilleurs candidats dont on garde la réponse
+        objective : critère de classement ("IAE", "ISE", "settling_time", ...)
+
+    Returns:
+        dict contenant :
+            - metrics : indicateurs pour chaque jeu de gains
+            - best : réponses temporelles des meilleurs candidats
+    """
+    return sweep_pid_gains(num, den, Kp, Ki, Kd, grid=grid, n_jobs=n_jobs,
+                           keep_best=keep_best, objective=objective)
+
+
+def nyquist_pid(num, den, Kp, Ki, Kd):
+    """
+    Analyse de Nyquist de la boucle PID * FT
+
+    Args:
+        num, den : numérateur et dénominateur de la FT
+        Kp, Ki, Kd : gains PID (scalaires), ou tableaux de même longueur pour un lot
+
+    Returns:
+        pour un seul jeu de gains, dict contenant :
+            - real, imag : données du diagramme de Nyquist
+            - encirclements, open_loop_rhp_poles, closed_loop_rhp_poles
+            - stable : verdict de stabilité en boucle fermée
+            - min_distance : distance minimale au point -1
+        pour un lot, tableau structuré avec les mêmes indicateurs par jeu de gains
+    """
+    if any(np.ndim(g) for g in (Kp, Ki, Kd)):
+        return pid_nyquist_batch(num, den, Kp, Ki, Kd)
+
+    sys = PIDModel(num, den)
+    sys.set_pid_gains(Kp, Ki, Kd)
+    analysis = sys.nyquist_analysis()
+    real, imag = sys.nyquist_plot_data()
+    return {
+        "real": real,
+        "imag": imag,
+        "encirclements": analysis["encirclements"],
+        "open_loop_rhp_poles": analysis["open_loop_rhp_poles"],
+        "closed_loop_rhp_poles": analysis["closed_loop_rhp_poles"],
+        "stable": analysis["stable"],
+        "min_distance": analysis["min_distance"]
+    }
+
+
+def autotune_pid(num, den, **options):
+    """
+    Règle automatiquement un PID puis simule la boucle fermée obtenue
+
+    Args:
+        num, den : numérateur et dénominateur de la FT
+        options : paramètres de autotune_pid_gains (objective, max_overshoot,
+                  min_phase_margin, min_gain_margin, max_sensitivity, time_budget, ...)
+
+    Returns:
+        dict contenant :
+            - Kp, Ki, Kd : gains trouvés
+            - Ku, Tu : gain et période critiques du procédé
+            - cost, metrics, margins : coût et indicateurs du meilleur candidat
+            - t, y : réponse indicielle en boucle fermée
+            - n_evaluations, elapsed, stop_reason : bilan de l’optimisation
+    """
+    sys = PIDModel(num, den)
+    result = sys.autotune(**options)
+    t, y = sys.closed_loop_response()
+
+    return {
+        "Kp": result["Kp"],
+        "Ki": result["Ki"],
+        "Kd": result["Kd"],
+        "Ku": result["Ku"],
+        "Tu": result["Tu"],
+        "cost": result["cost"],
+        "metrics": result["metrics"],
+        "margins": result["margins"],
+        "t": t,
+        "y": y,
+        "n_evaluations": result["n_evaluations"],
+        "elapsed": result["elapsed"],
+        "stop_reason": result["stop_reason"]
+    }
+
+
+def simulate_discrete_pid(num, den, Kp, Ki, Kd, Ts, t_final=20.0, N=10.0, method='tustin',
+                          u_min=None, u_max=None, anti_windup='clamping', reference=1.0):
+    """
+    Simule la boucle fermée échantillonnée avec un PID discret
+
+    Args:
+        num, den : numérateur et dénominateur de la FT (strictement propre)
+        Kp, Ki, Kd : gains PID
+        Ts : période d’échantillonnage
+        t_final : durée simulée
+        N : coupure du filtre de dérivée
+        method : 'tustin' ou 'backward_euler'
+        u_min, u_max : saturation de la commande
+        anti_windup : None, 'clamping' ou 'back_calculation'
+        reference : consigne (scalaire ou tableau d’échantillons)
+
+    Returns:
+        dict contenant :
+            - t, y, u, e : temps, sortie, commande appliquée, erreur
+            - fast_path : True si la commande n’a jamais saturé
+            - n_stepped : nombre d’échantillons calculés pas à pas (saturation)
+    """
+    sys = PIDModel(num, den)
+    sys.set_pid_gains(Kp, Ki, Kd)
+    return sys.simulate_discrete(Ts, t_final=t_final, reference=reference, N=N, method=method,
+                                 u_min=u_min, u_max=u_max, anti_windup=anti_windup)
@@ -4,9 +4,12 @@
 Contrôleur pour la commande par retour d’état :
 - Calcul du gain K pour placement de pôles
 - Simulation boucle ouverte et boucle fermée
+- Simulation par lot sur un ensemble d'états initiaux
+- Placement de pôles par lot
 """
 
-from modules.state_feedback import StateFeedbackController
+import numpy as np
+from modules.state_feedback import StateFeedbackController, initial_conditions_grid
 
 def compute_state_feedback(A, B, desired_poles, x0, t_span):
     """
@@ -35,3 +38,57 @@ def compute_state_feedback(A, B, desired_poles, x0, t_span):
         "t_closed": t_cl,
         "y_closed": y_cl
     }
+
+
+def compute_state_feedback_batch(A, B, desired_poles, X0, t_span):
+    """
+    Calcule le gain K une seule fois puis simule la boucle fermée
+    pour tout un lot d'états initiaux
+
+    Args:
+        A, B : matrices système
+        desired_poles : liste des pôles souhaités
+        X0 : tableau (N, n) d'états initiaux, ou dict {"bounds": [(min, max), ...], "points": k}
+             pour une grille régulière
+        t_span : tuple (t0, tf)
+
+    Returns:
+        dict contenant :
+            - gain K
+            - matrice de boucle fermée A_cl
+            - états initiaux utilisés (N, n)
+            - temps et trajectoires (N, n, T)
+    """
+    if isinstance(X0, dict):
+        X0 = initial_conditions_grid(X0["bounds"], X0["points"])
+
+    controller = StateFeedbackController(A, B)
+    K = controller.compute_gain(desired_poles)
+    t, Y = controller.simulate_closed_loop_batch(X0, t_span)
+
+    return {
+        "K": K,
+        "A_cl": controller.get_closed_loop_matrix(),
+        "x0": np.atleast_2d(np.asarray(X0, dtype=float)),
+        "t": t,
+        "y": Y
+    }
+
+
+def compute_state_feedback_gains_batch(A, B, poles_batch, n_jobs=1):
+    """
+    Calcule les gains K pour un lot de jeux de pôles sur le même système
+
+    Args:
+        A, B : matrices système
+        poles_batch : tableau (N, n) de jeux de pôles souhaités
+        n_jobs : nombre de processus (cas multi-entrées)
+
+    Returns:
+        dict contenant :
+            - gains K empilés (N, m, n)
+            - indicateurs par jeu de pôles (conditionnement, norme du gain, erreur de placement,
+              méthode utilisée, message d'erreur si le placement a échoué)
+    """
+    controller = StateFeedbackController(A, B)
+    return controller.compute_gain_batch(poles_batch, n_jobs=n_jobs)
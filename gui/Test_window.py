@@ -482,7 +482,7 @@ class MainWindow:
             entry_x0 = tk.Entry(frame_inputs, width=50)
             entry_x0.pack(pady=2)
 
-            tk.Label(frame_inputs, text="Point d'équilibre (ex: 0,0) :", font=("Arial", 12)).pack(pady=2)
+            tk.Label(frame_inputs, text="Point d'équilibre (ex: 0,0 ; vide : recherche auto) :", font=("Arial", 12)).pack(pady=2)
             entry_eq = tk.Entry(frame_inputs, width=50)
             entry_eq.pack(pady=2)
 
@@ -506,7 +506,7 @@ class MainWindow:
                     vars_list = [sp.symbols(v.strip()) for v in entry_vars.get().split(',')]
                     eqs_list = [sp.sympify(e.strip()) for e in entry_eqs.get().split(',')]
                     x0_vals = [float(x) for x in entry_x0.get().split(',')]
-                    eq_pt = [float(x) for x in entry_eq.get().split(',')]
+                    eq_pt = [float(x) for x in entry_eq.get().split(',')] if entry_eq.get().strip() else None
                     V_expr = entry_V.get()
 
                     results = analyze_nonlinear_system(vars_list, eqs_list, x0_vals, t_span=(0,20), eq_point=eq_pt, V_expr=V_expr)
@@ -524,6 +524,9 @@ class MainWindow:
                     fig.savefig(img_nl)
                     self.img_nl_path = img_nl  # Stocke le chemin dans l'objet principal
 
+                    if results['equilibria'] is not None:
+                        for eq in results['equilibria']:
+                            print("Équilibre :", np.round(eq['point'], 4), "-", eq['type'])
                     print("V(x) =", results['lyapunov_V'])
                     print("dV/dt =", results['dVdt'])
 
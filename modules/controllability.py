@@ -1,4 +1,125 @@
 import numpy as np
+from scipy.linalg import eig, qr
+from scipy.linalg.lapack import dormqr
+from scipy.sparse.csgraph import connected_components
+
+
+def krylov_matrix(A, B, early_stop=False, tol=None):
+    """
+    Construit la matrice de Krylov [B, AB, A²B, ..., A^{n-1}B] par récurrence :
+    A^iB = A (A^{i-1}B), écrit directement dans un tableau préalloué.
+
+    early_stop : arrête la construction dès qu'un bloc n'augmente plus le rang
+                 (le sous-espace de Krylov est alors invariant) ou que le rang vaut n ;
+                 la matrice retournée est tronquée mais de même rang.
+    tol : tolérance relative pour décider qu'une direction est nouvelle
+    """
+    n, m = B.shape
+    W = np.empty((n, n * m))
+    W[:, :m] = B
+    block = B
+
+    if early_stop:
+        if tol is None:
+            tol = max(n, m) * np.finfo(float).eps
+        # Base orthonormée du sous-espace engendré : ses r premières colonnes sont remplies
+        Q = np.empty((n, n))
+        r = 0
+
+    for i in range(n):
+        if i > 0:
+            block = A @ block
+            W[:, i * m:(i + 1) * m] = block
+        if early_stop:
+            # Part du bloc orthogonale au sous-espace déjà engendré (deux passes de Gram-Schmidt)
+            Qr = Q[:, :r]
+            R = block - Qr @ (Qr.T @ block)
+            R -= Qr @ (Qr.T @ R)
+            U, sv, _ = np.linalg.svd(R, full_matrices=False)
+            new = min(int(np.count_nonzero(sv > tol * max(np.linalg.norm(block), 1.0))), n - r)
+            if new == 0:
+                return W[:, :i * m]
+            Q[:, r:r + new] = U[:, :new]
+            r += new
+            if r >= n:
+                return W[:, :(i + 1) * m]
+    return W
+
+
+def _default_tol(A, B):
+    # Les quantités censées être nulles (bloc sous la marche, w^H B) sont calculées à partir d'un
+    # sous-espace invariant de A, connu à eps·‖A‖/sep près : l'amplification 1/sep n'est pas
+    # bornée a priori et dépasse souvent n, d'où une marge en √eps plutôt qu'en n·eps
+    return np.sqrt(np.finfo(float).eps) * max(np.linalg.norm(A), np.linalg.norm(B), 1.0)
+
+
+def staircase_decomposition(A, B, tol=None):
+    """
+    Réduction en escalier (forme de Hessenberg par blocs) de la paire (A, B)
+    par transformations orthogonales de Householder, sans former de puissances de A.
+
+    tol : seuil absolu sur la diagonale de R à chaque marche
+          (par défaut √eps·max(‖A‖, ‖B‖, 1), voir _default_tol)
+
+    Retourne (nc, T, At, Bt) avec At = T^T A T, Bt = T^T B :
+        nc : dimension du sous-espace contrôlable
+        At[nc:, nc:] : partie non contrôlable (ses valeurs propres sont les modes non contrôlables)
+    """
+    A = np.array(A, dtype=float)
+    B = np.array(B, dtype=float)
+    n = A.shape[0]
+    if tol is None:
+        tol = _default_tol(A, B)
+
+    At, Bt, T = A.copy(), B.copy(), np.eye(n)
+    nc, block = 0, Bt
+    while nc < n and block.size:
+        # QR à pivotage de colonnes du bloc courant : son rang donne la taille de la marche
+        (h, tau), R, _ = qr(block, mode='raw', pivoting=True)
+        # Bloc plus large que haut : seuls les tau.size premiers réflecteurs existent
+        h = h[:, :tau.size]
+        r = int(np.count_nonzero(np.abs(np.diag(R)) > tol))
+        if r == 0:
+            break
+        # Applique le facteur orthogonal Q sur les lignes/colonnes nc: (Q^T A Q, Q^T B, T Q)
+        At[nc:, :] = dormqr('L', 'T', h, tau, At[nc:, :], lwork=max(1, 64 * n))[0]
+        At[:, nc:] = dormqr('R', 'N', h, tau, At[:, nc:], lwork=max(1, 64 * n))[0]
+        Bt[nc:, :] = dormqr('L', 'T', h, tau, Bt[nc:, :], lwork=max(1, 64 * n))[0]
+        T[:, nc:] = dormqr('R', 'N', h, tau, T[:, nc:], lwork=max(1, 64 * n))[0]
+        prev, nc = nc, nc + r
+        block = At[nc:, prev:nc]
+    return nc, T, At, Bt
+
+
+def pbh_uncontrollable_modes(A, B, tol=None):
+    """
+    Test de Popov-Belevitch-Hautus : λ valeur propre de A est non contrôlable
+    si rang [A - λI, B] < n, c'est-à-dire s'il existe un vecteur propre à gauche w (w^H A = λ w^H)
+    tel que w^H B = 0. Une seule décomposition propre de A (O(n³)), puis pour chaque valeur
+    propre distincte : défaut de rang = dim(vecteurs propres à gauche) - rang(W^H B).
+
+    Retourne les modes non contrôlables, chacun répété autant de fois que le défaut de rang
+    de [A - λI, B] (multiplicité géométrique de λ dans la partie non contrôlable).
+    """
+    A = np.array(A, dtype=float)
+    B = np.array(B, dtype=float)
+    if tol is None:
+        tol = _default_tol(A, B)
+
+    lam, W = eig(A, left=True, right=False)
+    # Valeurs propres distinctes : regroupement des valeurs propres plus proches que tol
+    _, labels = connected_components(np.abs(lam[:, None] - lam[None, :]) <= tol, directed=False)
+
+    modes = []
+    for label in np.unique(labels):
+        cluster = np.flatnonzero(labels == label)
+        # Base orthonormée des vecteurs propres à gauche du groupe (presque colinéaires si λ est défectif)
+        U, sv, _ = np.linalg.svd(W[:, cluster], full_matrices=False)
+        U = U[:, sv > np.sqrt(np.finfo(float).eps) * sv[0]]
+        deficiency = U.shape[1] - int(np.count_nonzero(np.linalg.svd(U.conj().T @ B, compute_uv=False) > tol))
+        modes.extend([lam[cluster].mean()] * deficiency)
+    return np.array(modes)
+
 
 class ControlObservabilityAnalyzer:
     def __init__(self, A, B, C,D):
@@ -7,47 +128,136 @@ class ControlObservabilityAnalyzer:
         self.C = np.array(C, dtype=float)
         self.D = np.array(D, dtype=float)
 
-        self.n = self.A.shape[0]
+        # Résultats calculés à la demande (matrices, valeurs singulières, rangs)
+        self._cache = {}
+        self._cache_key = None
+
+    @property
+    def n(self):
+        return self.A.shape[0]
+
+    def _fingerprint(self):
+        return tuple((M.shape, M.tobytes()) for M in (self.A, self.B, self.C))
 
-    def controllability_matrix(self):
+    def _cached(self, name, compute):
+        """
+        Renvoie le résultat mémorisé `name`, recalculé si A, B ou C ont changé
+        """
+        key = self._fingerprint()
+        if key != self._cache_key:
+            self._cache.clear()
+            self._cache_key = key
+        if name not in self._cache:
+            self._cache[name] = compute()
+        return self._cache[name]
+
+    def controllability_matrix(self, early_stop=False):
         """
         Génère la matrice de contrôlabilité Wc = [B, AB, A²B, ..., A^{n-1}B]
         """
-        Wc = self.B
-        for i in range(1, self.n):
-            Wc = np.hstack((Wc, np.linalg.matrix_power(self.A, i) @ self.B))
-        return Wc
+        if early_stop:
+            return krylov_matrix(self.A, self.B, early_stop)
+        return self._cached("Wc", lambda: krylov_matrix(self.A, self.B))
 
-    def observability_matrix(self):
+    def observability_matrix(self, early_stop=False):
         """
         Génère la matrice d'observabilité Wo = [C^T, (CA)^T, (CA^2)^T, ..., (CA^{n-1})^T]^T
         """
-        Wo = self.C
-        for i in range(1, self.n):
-            Wo = np.vstack((Wo, self.C @ np.linalg.matrix_power(self.A, i)))
-        return Wo
+        if early_stop:
+            return krylov_matrix(self.A.T, self.C.T, early_stop).T
+        return self._cached("Wo", lambda: krylov_matrix(self.A.T, self.C.T).T)
+
+    def controllability_singular_values(self):
+        """
+        Valeurs singulières de Wc (calculées une seule fois)
+        """
+        return self._cached("sv_Wc", lambda: np.linalg.svd(self.controllability_matrix(), compute_uv=False))
+
+    def observability_singular_values(self):
+        """
+        Valeurs singulières de Wo (calculées une seule fois)
+        """
+        return self._cached("sv_Wo", lambda: np.linalg.svd(self.observability_matrix(), compute_uv=False))
+
+    @staticmethod
+    def _rank(M):
+        # Même seuil que numpy.linalg.matrix_rank
+        if M.size == 0:
+            return 0
+        sv = np.linalg.svd(M, compute_uv=False)
+        tol = sv.max() * max(M.shape) * np.finfo(float).eps
+        return int(np.count_nonzero(sv > tol))
+
+    def controllability_rank(self):
+        """
+        Rang de Wc, calculé sur la matrice de Krylov tronquée dès que le rang sature
+        (krylov_matrix(early_stop=True), de même rang que Wc)
+        """
+        return self._cached("rank_Wc", lambda: self._rank(self.controllability_matrix(early_stop=True)))
+
+    def observability_rank(self):
+        """
+        Rang de Wo, calculé sur la matrice de Krylov tronquée dès que le rang sature
+        """
+        return self._cached("rank_Wo", lambda: self._rank(self.observability_matrix(early_stop=True)))
+
+    def controllable_subspace(self, method='staircase', tol=None):
+        """
+        Dimension du sous-espace contrôlable et modes non contrôlables
+        method : 'staircase' (réduction en escalier) ou 'pbh' (test de Popov-Belevitch-Hautus)
+        tol : tolérance absolue de décision de rang (None : √eps·max(‖A‖, ‖B‖, 1))
+
+        Avec 'pbh', la dimension est n moins la somme des défauts de rang de [A - λI, B] :
+        elle est exacte si les modes non contrôlables ne sont pas défectifs (blocs de Jordan),
+        sinon c'est un majorant.
+        """
+        if method == 'staircase':
+            nc, _, At, _ = staircase_decomposition(self.A, self.B, tol)
+            modes = np.linalg.eigvals(At[nc:, nc:])
+        elif method == 'pbh':
+            modes = pbh_uncontrollable_modes(self.A, self.B, tol)
+            nc = self.n - len(modes)
+        else:
+            raise ValueError(f"Méthode inconnue : {method}")
+        return {"dimension": nc, "uncontrollable_modes": modes}
+
+    def observable_subspace(self, method='staircase', tol=None):
+        """
+        Dimension du sous-espace observable et modes non observables (par dualité sur (A^T, C^T))
+        """
+        dual = ControlObservabilityAnalyzer(self.A.T, self.C.T, self.B.T, self.D.T)
+        result = dual.controllable_subspace(method, tol)
+        return {"dimension": result["dimension"], "unobservable_modes": result["uncontrollable_modes"]}
 
-    def is_controllable(self):
+    def is_controllable(self, method='krylov', tol=None):
         """
         Renvoie 'True' si le rang de Wc est égal à n
+        method : 'krylov' (rang de Wc), 'staircase' ou 'pbh' (sans puissances de A)
+        tol : tolérance des méthodes 'staircase' et 'pbh' (voir controllable_subspace)
         """
-        Wc = self.controllability_matrix()
-        return np.linalg.matrix_rank(Wc) == self.n
+        if method == 'krylov':
+            return self.controllability_rank() == self.n
+        return self.controllable_subspace(method, tol)["dimension"] == self.n
 
-    def is_observable(self):
+    def is_observable(self, method='krylov', tol=None):
         """
         Renvoie True si le rang de Wo est égal à n
+        method : 'krylov' (rang de Wo), 'staircase' ou 'pbh' (sans puissances de A)
+        tol : tolérance des méthodes 'staircase' et 'pbh' (voir observable_subspace)
         """
-        Wo = self.observability_matrix()
-        return np.linalg.matrix_rank(Wo) == self.n
+        if method == 'krylov':
+            return self.observability_rank() == self.n
+        return self.observable_subspace(method, tol)["dimension"] == self.n
 
     def summary(self):
         """
         Donne un résumé texte des verdicts de contrôlabilité et observabilité
         """
+        controllable = "le système est Contrôlable" if self.is_controllable() else "le système n'est pas contrôlable"
+        observable = "le système est Observable" if self.is_observable() else "le sytème n'est pas observable"
         verdict = ""
-        verdict += f"Rang de Wc : {np.linalg.matrix_rank(self.controllability_matrix())} "
-        verdict += f"=> {'le système est Contrôlable' if self.is_controllable() else "le système n'est pas contrôlable"}\n"
-        verdict += f"Rang de Wo : {np.linalg.matrix_rank(self.observability_matrix())} "
-        verdict += f"=> {'le système est Observable' if self.is_observable() else "le sytème n'est pas observable"}"
+        verdict += f"Rang de Wc : {self.controllability_rank()} "
+        verdict += f"=> {controllable}\n"
+        verdict += f"Rang de Wo : {self.observability_rank()} "
+        verdict += f"=> {observable}"
         return verdict
@@ -0,0 +1,257 @@
+"""
+PID discret et simulation échantillonnée :
+- PID parallèle u = Kp e + I + D, intégrale par Tustin ou Euler implicite,
+  dérivée filtrée Kd N s / (s + N), saturation de la commande et anti-emballement
+  (blocage de l'intégrale ou recalcul « back-calculation »)
+- procédé discrétisé exactement (bloqueur d'ordre zéro) au pas d'échantillonnage Ts
+- boucle fermée : tant que la commande reste dans ses limites, la boucle est linéaire ; elle est
+  diagonalisée et chaque mode est propagé par scipy.signal.lfilter (récurrence du premier ordre,
+  bien conditionnée) sur des fenêtres de taille croissante. Les échantillons saturés passent
+  par la boucle pas à pas (DiscretePID.step) ; on ne revient au chemin linéaire qu'après une
+  série d'échantillons non saturés (hystérésis), allongée tant que les tentatives échouent.
+"""
+
+from operator import mul
+
+import numpy as np
+from scipy.linalg import expm
+from scipy.signal import lfilter
+
+DISCRETIZATION_METHODS = ('tustin', 'backward_euler')
+ANTI_WINDUP_METHODS = (None, 'clamping', 'back_calculation')
+
+
+class DiscretePID:
+    def __init__(self, Kp, Ki, Kd, Ts, N=10.0, method='tustin', u_min=None, u_max=None,
+                 anti_windup='clamping', Kb=None):
+        """
+        Kp, Ki, Kd : gains du PID parallèle
+        Ts : période d'échantillonnage (s)
+        N : pulsation de coupure du filtre de dérivée Kd N s / (s + N)
+        method : 'tustin' ou 'backward_euler'
+        u_min, u_max : saturation de la commande (None : pas de limite)
+        anti_windup : None, 'clamping' ou 'back_calculation'
+        Kb : gain de recalcul, utilisé seulement avec 'back_calculation'
+             (par défaut 1/√(Ti Td), ou 1/Ti sans dérivée, borné par 1/Ts ; 1/Ts si Kp = 0)
+        """
+        if method not in DISCRETIZATION_METHODS:
+            raise ValueError(f"Méthode de discrétisation inconnue : {method}")
+        if anti_windup not in ANTI_WINDUP_METHODS:
+            raise ValueError(f"Anti-emballement inconnu : {anti_windup}")
+        self.Kp, self.Ki, self.Kd = float(Kp), float(Ki), float(Kd)
+        self.Ts, self.N = float(Ts), float(N)
+        self.method = method
+        self.u_min = -np.inf if u_min is None else float(u_min)
+        self.u_max = np.inf if u_max is None else float(u_max)
+        self.anti_windup = anti_windup
+        if Kb is None and anti_windup == 'back_calculation':
+            Ti = self.Kp / self.Ki if self.Ki else np.inf
+            Td = self.Kd / self.Kp if self.Kp else 0.0
+            if Ti == 0:
+                # Intégrateur pur (Kp = 0) : recalcul en un seul pas d'échantillonnage
+                Kb = 1 / self.Ts
+            else:
+                Kb = min(1 / np.sqrt(Ti * Td) if Td > 0 else 1 / Ti, 1 / self.Ts)
+        self.Kb = 0.0 if Kb is None else float(Kb)
+
+        # Coefficients des récurrences : I_k = I_{k-1} + ci0 e_k + ci1 e_{k-1}
+        #                               D_k = ad D_{k-1} + bd (e_k - e_{k-1})
+        Ts, N, Kd = self.Ts, self.N, self.Kd
+        if method == 'tustin':
+            self._ci = (self.Ki * Ts / 2, self.Ki * Ts / 2)
+            self._ad, self._bd = (2 - N * Ts) / (2 + N * Ts), 2 * Kd * N / (2 + N * Ts)
+        else:
+            self._ci = (self.Ki * Ts, 0.0)
+            self._ad, self._bd = 1 / (1 + N * Ts), Kd * N / (1 + N * Ts)
+        self.reset()
+
+    def reset(self, integral=0.0):
+        """
+        Remet à zéro les états internes (intégrale, dérivée, erreur précédente)
+        """
+        self.integral = float(integral)
+        self.derivative = 0.0
+        self.e_prev = 0.0
+        self.saturated = False
+
+    @property
+    def has_limits(self):
+        return np.isfinite(self.u_min) or np.isfinite(self.u_max)
+
+    def coefficients(self):
+        """
+        Fonction de transfert discrète du PID sans saturation, en puissances de z⁻¹ : (b, a)
+        """
+        ci0, ci1 = self._ci
+        # C(z) = Kp + (ci0 + ci1 z⁻¹)/(1 - z⁻¹) + bd (1 - z⁻¹)/(1 - ad z⁻¹)
+        a = np.convolve([1.0, -1.0], [1.0, -self._ad])
+        b = (self.Kp * a
+             + np.convolve([ci0, ci1], [1.0, -self._ad])
+             + self._bd * np.convolve([1.0, -1.0], [1.0, -1.0]))
+        return b, a
+
+    def state_space(self):
+        """
+        Réalisation d'état du PID sans saturation, d'état xc = (intégrale, dérivée, erreur précédente)
+        avant le pas k : xc_{k+1} = Ac xc_k + Bc e_k, u_k = Cc xc_k + Dc e_k
+        """
+        ci0, ci1 = self._ci
+        Ac = np.array([[1.0, 0.0, ci1], [0.0, self._ad, -self._bd], [0.0, 0.0, 0.0]])
+        Bc = np.array([ci0, self._bd, 1.0])
+        Cc = np.array([1.0, self._ad, ci1 - self._bd])
+        Dc = self.Kp + ci0 + self._bd
+        return Ac, Bc, Cc, Dc
+
+    def step(self, e):
+        """
+        Un pas de calcul (comme sur le calculateur embarqué) : erreur e_k -> commande saturée u_k
+        self.saturated indique si la saturation (donc l'anti-emballement) est intervenue,
+        même si la commande recalculée avec l'intégrale bloquée est revenue dans ses limites
+        """
+        ci0, ci1 = self._ci
+        integral = self.integral + ci0 * e + ci1 * self.e_prev
+        self.derivative = self._ad * self.derivative + self._bd * (e - self.e_prev)
+        u = self.Kp * e + integral + self.derivative
+        u_sat = min(max(u, self.u_min), self.u_max)
+
+        self.saturated = u_sat != u
+        if self.saturated:
+            if self.anti_windup == 'clamping' and (u - u_sat) * e > 0:
+                # L'erreur pousse plus loin dans la saturation : on n'intègre pas
+                integral = self.integral
+                u = self.Kp * e + integral + self.derivative
+                u_sat = min(max(u, self.u_min), self.u_max)
+            elif self.anti_windup == 'back_calculation':
+                integral += self.Kb * self.Ts * (u_sat - u)
+
+        self.integral = integral
+        self.e_prev = e
+        return u_sat
+
+
+def zoh_plant(num, den, Ts):
+    """
+    Discrétisation exacte (bloqueur d'ordre zéro) d'un procédé strictement propre num/den
+    Retourne (Phi, Gamma, C) : x_{k+1} = Phi x_k + Gamma u_k, y_k = C x_k
+    """
+    num = np.trim_zeros(np.atleast_1d(np.asarray(num, dtype=float)), 'f')
+    den = np.trim_zeros(np.atleast_1d(np.asarray(den, dtype=float)), 'f')
+    if num.size >= den.size:
+        raise ValueError("Le procédé doit être strictement propre (pas de boucle algébrique).")
+
+    # Forme compagne commandable
+    a = den[1:] / den[0]
+    b = np.concatenate([np.zeros(den.size - num.size), num])[1:] / den[0]
+    n = a.size
+    A = np.zeros((n, n))
+    A[0, :] = -a
+    A[np.arange(1, n), np.arange(n - 1)] = 1.0
+
+    M = np.zeros((n + 1, n + 1))
+    M[:n, :n] = A
+    M[0, n] = 1.0
+    E = expm(M * Ts)
+    return E[:n, :n], E[:n, n], b
+
+
+def _closed_loop(Phi, Gamma, C, controller):
+    """
+    Boucle fermée linéaire (sans saturation) d'état z = [x ; xc], d'entrée la consigne r :
+    z_{k+1} = A z_k + B r_k, y_k = Cy z_k, u_k = Cu z_k + Du r_k
+    """
+    Ac, Bc, Cc, Dc = controller.state_space()
+    n = C.size
+    A = np.zeros((n + 3, n + 3))
+    A[:n, :n] = Phi - Dc * np.outer(Gamma, C)
+    A[:n, n:] = np.outer(Gamma, Cc)
+    A[n:, :n] = -np.outer(Bc, C)
+    A[n:, n:] = Ac
+    B = np.concatenate([Dc * Gamma, Bc])
+    Cy = np.concatenate([C, np.zeros(3)])
+    Cu = np.concatenate([-Dc * C, Cc])
+    return A, B, Cy, Cu, Dc
+
+
+def simulate_sampled_loop(num, den, controller, t_final=None, n_samples=None, reference=1.0, window=256,
+                          min_hold=16):
+    """
+    Simulation en boucle fermée échantillonnée : e_k = r_k - y_k, u_k = PID(e_k),
+    procédé exact entre deux instants (commande bloquée).
+
+    controller : DiscretePID (ses états sont remis à zéro)
+    t_final ou n_samples : horizon ; reference : consigne scalaire ou tableau (n_samples,)
+    window : taille initiale des fenêtres du chemin linéaire en présence de saturation
+    min_hold : nombre minimal d'échantillons consécutifs non saturés avant de retenter le chemin
+               linéaire (hystérésis) ; ce nombre double à chaque tentative qui sature dès le
+               premier échantillon (boucle qui reste collée à la limite), et revient à min_hold
+               dès qu'une tentative progresse
+    Retourne un dict : t, y, u, e, fast_path (True si aucun échantillon n'a été saturé)
+    et n_stepped (nombre d'échantillons calculés pas à pas)
+    """
+    Ts = controller.Ts
+    if n_samples is None:
+        if t_final is None:
+            raise ValueError("Préciser t_final ou n_samples.")
+        n_samples = int(round(t_final / Ts)) + 1
+    t = np.arange(n_samples) * Ts
+    r = np.ascontiguousarray(np.broadcast_to(np.asarray(reference, dtype=float), (n_samples,)))
+    Phi, Gamma, C = zoh_plant(num, den, Ts)
+    n = C.size
+
+    A, B, Cy, Cu, Du = _closed_loop(Phi, Gamma, C, controller)
+    lam, V = np.linalg.eig(A)
+    # Base modale mal conditionnée (pôles multiples) : tout est calculé pas à pas
+    modal = np.linalg.cond(V) < 1e8
+    if modal:
+        V_inv = np.linalg.inv(V)
+        beta, cy, cu = V_inv @ B, Cy @ V, Cu @ V
+
+    controller.reset()
+    Phi_rows, Gamma_list, C_list, r_list = Phi.tolist(), Gamma.tolist(), C.tolist(), r.tolist()
+    y = np.empty(n_samples)
+    u = np.empty(n_samples)
+    z = np.zeros(n + 3)
+    k, size, stepped, hold = 0, window, 0, min_hold
+
+    while k < n_samples:
+        if modal:
+            # Chemin linéaire : w_{k+1} = λ w_k + β r_k pour chaque mode
+            end = min(k + size, n_samples) if controller.has_limits else n_samples
+            w0 = V_inv @ z
+            Q = np.empty((lam.size, end - k), dtype=complex)
+            w_end = np.empty(lam.size, dtype=complex)
+            for i in range(lam.size):
+                Q[i], zf = lfilter([0.0, beta[i]], [1.0, -lam[i]], r[k:end], zi=[w0[i]])
+                w_end[i] = zf[0]
+            y_lin = (cy @ Q).real
+            u_lin = (cu @ Q).real + Du * r[k:end]
+            inside = (u_lin >= controller.u_min) & (u_lin <= controller.u_max)
+            j = inside.size if inside.all() else int(np.argmin(inside))
+            y[k:k + j], u[k:k + j] = y_lin[:j], u_lin[:j]
+            if j == inside.size:
+                z = (V @ w_end).real
+                k, size, hold = end, 2 * size, min_hold
+                continue
+            z = (V @ Q[:, j]).real
+            # Échec immédiat : on attendra plus longtemps avant la prochaine tentative
+            hold = min(2 * hold, n_samples) if j == 0 else min_hold
+            k, size = k + j, window
+
+        # Pas à pas tant que la commande est saturée, puis pendant `hold` échantillons non saturés
+        x = z[:n].tolist()
+        controller.integral, controller.derivative, controller.e_prev = z[n:].tolist()
+        step = controller.step
+        run = 0
+        while k < n_samples:
+            yk = sum(map(mul, C_list, x))
+            uk = step(r_list[k] - yk)
+            x = [sum(map(mul, row, x)) + g * uk for row, g in zip(Phi_rows, Gamma_list)]
+            y[k], u[k] = yk, uk
+            k += 1
+            stepped += 1
+            run = 0 if controller.saturated else run + 1
+            if modal and run >= hold:
+                break
+        z = np.array(x + [controller.integral, controller.derivative, controller.e_prev])
+
+    return {"t": t, "y": y, "u": u, "e": r - y, "fast_path": stepped == 0, "n_stepped": stepped}
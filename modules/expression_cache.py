@@ -0,0 +1,299 @@
+"""
+Cache des fonctions compilées (lambdify) pour les systèmes non linéaires :
+dynamique, Jacobienne et dérivée de Lyapunov.
+
+Le cache mémoire est partagé par tout le processus et borné (LRU). Il est indexé par les
+entrées brutes (objets SymPy ou chaînes, hachables) : un appel déjà vu ne refait ni sympify
+ni srepr, la clé canonique n'étant calculée qu'au premier appel. Un cache disque
+optionnel (set_disk_cache) conserve le code source généré par lambdify et les
+expressions symboliques, ce qui évite de refaire les calculs SymPy entre deux sessions.
+
+Le contenu relu sur disque est exécuté : il est d'abord vérifié (_check_source, _check_srepr),
+seules les formes produites par lambdify et srepr étant acceptées, sinon l'entrée est
+recompilée. Cette vérification ne remplace pas le contrôle d'accès : le répertoire du cache
+doit rester accessible en écriture au seul utilisateur.
+"""
+
+import ast
+import hashlib
+import inspect
+import json
+import os
+from collections import OrderedDict
+from functools import reduce
+
+import numpy as np
+import sympy as sp
+from sympy.utilities.lambdify import lambdify
+
+_CACHE = OrderedDict()
+# Entrées brutes -> clé canonique (même taille maximale que _CACHE)
+_RAW_KEYS = OrderedDict()
+_CACHE_SIZE = 128
+_DISK_DIR = None
+_NAMESPACE = None
+
+
+def set_cache_size(size):
+    """
+    Fixe le nombre maximal d'entrées du cache mémoire
+    """
+    global _CACHE_SIZE
+    _CACHE_SIZE = int(size)
+    for cache in (_CACHE, _RAW_KEYS):
+        while len(cache) > _CACHE_SIZE:
+            cache.popitem(last=False)
+
+
+def set_disk_cache(directory):
+    """
+    Active le cache disque dans `directory` (None le désactive)
+    """
+    global _DISK_DIR
+    _DISK_DIR = directory
+    if directory is not None:
+        os.makedirs(directory, exist_ok=True)
+
+
+def clear_cache():
+    """
+    Vide le cache mémoire (le cache disque est conservé)
+    """
+    _CACHE.clear()
+    _RAW_KEYS.clear()
+
+
+def canonical_key(kind, state_vars, exprs, *extra):
+    """
+    Clé canonique (SHA-256) d'un modèle : forme srepr des variables et des expressions
+    """
+    parts = [kind, sp.srepr(sp.Tuple(*state_vars)), sp.srepr(sp.Tuple(*[sp.sympify(e) for e in exprs]))]
+    parts += [sp.srepr(sp.sympify(e)) for e in extra]
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def _memory_key(kind, state_vars, exprs, *extra):
+    """
+    Clé canonique du modèle, retrouvée sans calcul SymPy si les mêmes entrées ont déjà été vues
+    (comparées avec leur type : 1 et 1.0 restent distincts)
+    """
+    raw = (kind,) + tuple(tuple((type(e), e) for e in group) for group in (state_vars, exprs, extra))
+    try:
+        key = _RAW_KEYS.get(raw)
+    except TypeError:
+        # Entrée non hachable (ex : Matrix mutable) : clé canonique à chaque appel
+        return canonical_key(kind, state_vars, exprs, *extra)
+    if key is not None:
+        _RAW_KEYS.move_to_end(raw)
+        return key
+    key = _RAW_KEYS[raw] = canonical_key(kind, state_vars, exprs, *extra)
+    if len(_RAW_KEYS) > _CACHE_SIZE:
+        _RAW_KEYS.popitem(last=False)
+    return key
+
+
+def _namespace():
+    # Espace de noms utilisé par lambdify pour le module 'numpy'
+    global _NAMESPACE
+    if _NAMESPACE is None:
+        _NAMESPACE = dict(lambdify([], 0, modules='numpy').__globals__)
+        # Importé par lambdify seulement dans les fonctions qui l'utilisent (Max, Min)
+        _NAMESPACE.setdefault('reduce', reduce)
+    return _NAMESPACE
+
+
+def _allowed_functions():
+    # Fonctions mathématiques pures que lambdify peut appeler (ufuncs numpy et quelques utilitaires)
+    namespace = _namespace()
+    names = {name for name, value in namespace.items() if isinstance(value, np.ufunc)}
+    names |= {"select", "reduce", "array", "amax", "amin", "where", "real", "imag", "angle", "sinc"}
+    return names & set(namespace)
+
+
+_CONSTANTS = {"pi", "e", "nan", "inf", "I", "True", "False", "None"}
+_EXPRESSION_NODES = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.Constant,
+                     ast.List, ast.Tuple, ast.Load, ast.Store, ast.operator, ast.unaryop, ast.boolop,
+                     ast.cmpop, ast.keyword, ast.Call, ast.Name)
+
+
+def _check_source(source):
+    """
+    Vérifie qu'un code source relu sur disque a la forme produite par lambdify :
+    une fonction _lambdifygenerated dont le corps n'est fait que d'affectations de variables
+    (cse) et d'un return, n'appelant que des fonctions mathématiques (pas d'attribut,
+    d'import ni de fonction intégrée). Lève ValueError sinon.
+    """
+    tree = ast.parse(source)
+    if len(tree.body) != 1 or not isinstance(tree.body[0], ast.FunctionDef) \
+            or tree.body[0].name != '_lambdifygenerated' or tree.body[0].decorator_list:
+        raise ValueError("Source inattendue dans le cache disque")
+    func = tree.body[0]
+    names = {a.arg for a in func.args.args} | _CONSTANTS
+    functions = _allowed_functions()
+    for statement in func.body:
+        if isinstance(statement, ast.Assign) and all(isinstance(t, ast.Name) for t in statement.targets):
+            value = statement.value
+        elif isinstance(statement, ast.Return) and statement is func.body[-1]:
+            value = statement.value
+        else:
+            raise ValueError("Instruction inattendue dans le cache disque")
+        for node in ast.walk(value):
+            if not isinstance(node, _EXPRESSION_NODES):
+                raise ValueError(f"Construction interdite dans le cache disque : {type(node).__name__}")
+            if isinstance(node, ast.Call) and not (isinstance(node.func, ast.Name) and node.func.id in functions):
+                raise ValueError("Appel interdit dans le cache disque")
+            if isinstance(node, ast.Name) and node.id not in names | functions:
+                raise ValueError(f"Nom inconnu dans le cache disque : {node.id}")
+        if isinstance(statement, ast.Assign):
+            names |= {t.id for t in statement.targets}
+
+
+def _sympy_classes():
+    # Classes SymPy nommées dans une sortie de srepr (y compris celles non exportées, ex : ExprCondPair)
+    classes, stack = {}, [sp.Basic, sp.MatrixBase]
+    while stack:
+        cls = stack.pop()
+        classes.setdefault(cls.__name__, cls)
+        stack.extend(cls.__subclasses__())
+    classes.update({name: value for name, value in vars(sp).items()
+                    if isinstance(value, type) and issubclass(value, (sp.Basic, sp.MatrixBase))
+                    or isinstance(value, sp.Basic)})
+    return classes
+
+
+def _check_srepr(text):
+    """
+    Vérifie qu'une expression relue sur disque a la forme produite par srepr :
+    appels de classes SymPy sur des constantes. Lève ValueError sinon.
+    Retourne l'arbre syntaxique et l'espace de noms à utiliser pour l'évaluer.
+    """
+    namespace = _sympy_classes()
+    tree = ast.parse(text, mode='eval')
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name):
+                raise ValueError("Appel interdit dans le cache disque")
+        elif isinstance(node, ast.Name):
+            if node.id not in namespace:
+                raise ValueError(f"Nom inconnu dans le cache disque : {node.id}")
+        elif not isinstance(node, (ast.Expression, ast.Constant, ast.List, ast.Tuple, ast.keyword,
+                                   ast.UnaryOp, ast.USub, ast.Load)):
+            raise ValueError(f"Construction interdite dans le cache disque : {type(node).__name__}")
+    return tree, namespace
+
+
+def _rebuild(source):
+    _check_source(source)
+    namespace = dict(_namespace())
+    exec(source, namespace)
+    return namespace['_lambdifygenerated']
+
+
+def _parse(text):
+    tree, namespace = _check_srepr(text)
+    return eval(compile(tree, '<cache>', 'eval'), {'__builtins__': {}}, namespace)
+
+
+def _lookup(key, build, sources, restore):
+    """
+    Cherche `key` en mémoire, puis sur disque, sinon appelle `build`.
+    sources(entry) -> dict sérialisable ; restore(dict) -> entry
+    """
+    if key in _CACHE:
+        _CACHE.move_to_end(key)
+        return _CACHE[key]
+
+    entry = None
+    path = os.path.join(_DISK_DIR, key + ".json") if _DISK_DIR else None
+    if path and os.path.exists(path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = restore(json.load(f))
+        except (OSError, ValueError, KeyError, SyntaxError):
+            entry = None
+    if entry is None:
+        entry = build()
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(sources(entry), f)
+
+    _CACHE[key] = entry
+    if len(_CACHE) > _CACHE_SIZE:
+        _CACHE.popitem(last=False)
+    return entry
+
+
+def compile_dynamics(state_vars, exprs):
+    """
+    Fonction compilée de la dynamique f(x)
+    Retourne un dict {"f": ...}
+    """
+    key = _memory_key("dynamics", state_vars, exprs)
+
+    def build():
+        return {"f": lambdify(state_vars, list(exprs), modules='numpy')}
+
+    def sources(entry):
+        return {"f": inspect.getsource(entry["f"])}
+
+    def restore(data):
+        return {"f": _rebuild(data["f"])}
+
+    return _lookup(key, build, sources, restore)
+
+
+def compile_jacobian(state_vars, exprs, cse=False):
+    """
+    Jacobienne symbolique ∂f/∂x et sa version compilée (liste aplatie n×n), entrée du cache
+    distincte de la dynamique : elle n'est dérivée qu'à la première demande
+    Retourne un dict {"J": ..., "jacobian": ...}
+    """
+    key = _memory_key("jacobian", state_vars, exprs, int(cse))
+
+    def build():
+        J = sp.Matrix(exprs).jacobian(state_vars)
+        return {"J": J, "jacobian": lambdify(state_vars, list(J), modules='numpy', cse=cse)}
+
+    def sources(entry):
+        return {"J": sp.srepr(entry["J"]), "jacobian": inspect.getsource(entry["jacobian"])}
+
+    def restore(data):
+        return {"J": sp.Matrix(_parse(data["J"])), "jacobian": _rebuild(data["jacobian"])}
+
+    return _lookup(key, build, sources, restore)
+
+
+def compile_lyapunov(state_vars, exprs, V_expr):
+    """
+    Expressions V(x), dV/dt = ∇V·f(x) et leurs versions compilées
+    Retourne un dict {"V", "dVdt", "V_func", "dVdt_func"}
+    """
+    key = _memory_key("lyapunov", state_vars, exprs, V_expr)
+
+    def build():
+        V = sp.sympify(V_expr)
+        dVdt = sum(sp.diff(V, xi) * fi for xi, fi in zip(state_vars, exprs))
+        return {
+            "V": V,
+            "dVdt": dVdt,
+            "V_func": lambdify(state_vars, V, modules='numpy'),
+            "dVdt_func": lambdify(state_vars, dVdt, modules='numpy'),
+        }
+
+    def sources(entry):
+        return {
+            "V": sp.srepr(entry["V"]),
+            "dVdt": sp.srepr(entry["dVdt"]),
+            "V_func": inspect.getsource(entry["V_func"]),
+            "dVdt_func": inspect.getsource(entry["dVdt_func"]),
+        }
+
+    def restore(data):
+        return {
+            "V": _parse(data["V"]),
+            "dVdt": _parse(data["dVdt"]),
+            "V_func": _rebuild(data["V_func"]),
+            "dVdt_func": _rebuild(data["dVdt_func"]),
+        }
+
+    return _lookup(key, build, sources, restore)
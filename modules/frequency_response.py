@@ -0,0 +1,201 @@
+"""
+Moteur commun de réponse fréquentielle H(jω) :
+- fonctions de transfert : évaluation vectorisée des polynômes (Horner) en s = jω
+- représentation d'état : une seule réduction de Hessenberg A = Q Hh Qᵀ, puis résolution
+  de (jωI - Hh) X = QᵀB pour toutes les fréquences à la fois (élimination de Hessenberg
+  vectorisée, pivot entre lignes adjacentes), en O(n²) par fréquence au lieu de O(n³)
+- grille adaptative : on part d'une grille logarithmique grossière complétée par les
+  pulsations propres, puis on subdivise les intervalles où le gain ou la phase varient
+  trop, ainsi que ceux qui contiennent un passage à 0 dB ou à -180°
+"""
+
+import numpy as np
+import control as ctrl
+from scipy.linalg import hessenberg
+
+
+def tf_evaluator(num, den):
+    """
+    Retourne une fonction omega -> H(jω) (T,) pour la fonction de transfert num/den
+    """
+    num = np.atleast_1d(np.asarray(num, dtype=float))
+    den = np.atleast_1d(np.asarray(den, dtype=float))
+
+    def evaluate(omega):
+        s = 1j * np.asarray(omega, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.polyval(num, s) / np.polyval(den, s)
+    return evaluate
+
+
+def _hessenberg_solve(Hh, R, omega):
+    """
+    Résout (jωI - Hh) X = R pour toutes les pulsations omega (T,)
+    Hh : matrice de Hessenberg supérieure (n, n) ; R : second membre (n, m)
+    Retourne X (T, n, m)
+    """
+    n = Hh.shape[0]
+    T = omega.size
+    M = np.broadcast_to(-Hh.astype(complex), (T, n, n)).copy()
+    M[:, np.arange(n), np.arange(n)] += 1j * omega[:, None]
+    X = np.broadcast_to(R.astype(complex), (T,) + R.shape).copy()
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Élimination : une seule sous-diagonale, pivot partiel entre les lignes k et k+1
+        for k in range(n - 1):
+            swap = np.abs(M[:, k + 1, k]) > np.abs(M[:, k, k])
+            if swap.any():
+                M[swap, k:k + 2, k:] = M[swap, k:k + 2, k:][:, ::-1]
+                X[swap, k:k + 2] = X[swap, k:k + 2][:, ::-1]
+            l = M[:, k + 1, k] / M[:, k, k]
+            M[:, k + 1, k:] -= l[:, None] * M[:, k, k:]
+            X[:, k + 1] -= l[:, None] * X[:, k]
+
+        # Remontée sur le système triangulaire supérieur
+        for k in range(n - 1, -1, -1):
+            if k < n - 1:
+                X[:, k] -= np.einsum('tj,tjm->tm', M[:, k, k + 1:], X[:, k + 1:])
+            X[:, k] /= M[:, k, k][:, None]
+    return X
+
+
+def ss_evaluator(A, B, C, D, chunk_size=256):
+    """
+    Retourne une fonction omega -> H(jω) (T, p, m) pour la représentation d'état (A, B, C, D).
+    La réduction de Hessenberg est faite une seule fois ; les pulsations sont traitées
+    par blocs de chunk_size.
+    """
+    A = np.atleast_2d(np.asarray(A, dtype=float))
+    B = np.atleast_2d(np.asarray(B, dtype=float))
+    C = np.atleast_2d(np.asarray(C, dtype=float))
+    D = np.atleast_2d(np.asarray(D, dtype=float))
+    Hh, Q = hessenberg(A, calc_q=True)
+    QtB = Q.T @ B
+    CQ = C @ Q
+
+    def evaluate(omega):
+        omega = np.atleast_1d(np.asarray(omega, dtype=float))
+        H = np.empty((omega.size,) + D.shape, dtype=complex)
+        for i in range(0, omega.size, chunk_size):
+            X = _hessenberg_solve(Hh, QtB, omega[i:i + chunk_size])
+            H[i:i + chunk_size] = CQ @ X + D
+        return H
+    return evaluate
+
+
+def default_frequency_range(poles, zeros=(), margin=2):
+    """
+    Plage de fréquences (exposants log10) couvrant les pulsations de cassure des pôles
+    et zéros non nuls, élargie de `margin` décades de chaque côté
+    """
+    breaks = np.abs(np.concatenate([np.atleast_1d(poles), np.atleast_1d(zeros)]).astype(complex))
+    breaks = breaks[breaks > 1e-12]
+    if breaks.size == 0:
+        return (-2, 2)
+    return (int(np.floor(np.log10(breaks.min()))) - margin,
+            int(np.ceil(np.log10(breaks.max()))) + margin)
+
+
+def _seed_frequencies(poles, zeros, frequency_range):
+    # Pulsations propres des pôles/zéros amortis (un pôle sur l'axe imaginaire rendrait H infini)
+    roots = np.concatenate([np.atleast_1d(poles), np.atleast_1d(zeros)]).astype(complex)
+    roots = roots[np.abs(roots.real) > 1e-12]
+    wn = np.abs(roots)
+    lo, hi = 10.0 ** np.asarray(frequency_range, dtype=float)
+    return wn[(wn > lo) & (wn < hi)]
+
+
+def adaptive_grid(evaluate, frequency_range, seeds=(), points_per_decade=10, max_points=2000,
+                  db_tol=1.0, phase_tol=5.0, min_decades=1e-4, max_iter=40):
+    """
+    Grille de fréquences adaptative
+
+    evaluate : fonction omega (T,) -> H (T, ...)
+    frequency_range : exposants log10 (min, max)
+    seeds : pulsations ajoutées à la grille initiale (ex : pulsations propres)
+    db_tol, phase_tol : variation maximale de gain (dB) et de phase (degrés) entre deux points
+    min_decades : largeur minimale d'un intervalle (en décades)
+
+    Un intervalle est subdivisé (point milieu géométrique) si le gain ou la phase y varient
+    plus que la tolérance, ou s'il contient un passage à 0 dB ou à -180°.
+    Retourne omega (T,) et H (T, ...)
+    """
+    lo, hi = frequency_range
+    n0 = max(int(np.ceil((hi - lo) * points_per_decade)) + 1, 2)
+    omega = np.unique(np.concatenate([np.logspace(lo, hi, n0), np.asarray(seeds, dtype=float)]))
+    H = evaluate(omega)
+
+    for _ in range(max_iter):
+        if omega.size >= max_points:
+            break
+        Hf = H.reshape(omega.size, -1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            db = 20 * np.log10(np.abs(Hf))
+            d_db = np.abs(np.diff(db, axis=0))
+            d_phase = np.degrees(np.abs(np.angle(Hf[1:] / Hf[:-1])))
+            score = np.fmax(d_db / db_tol, d_phase / phase_tol)
+            crossing = (np.diff(np.sign(db), axis=0) != 0) | (
+                (np.diff(np.sign(Hf.imag), axis=0) != 0) & ((Hf.real[1:] < 0) | (Hf.real[:-1] < 0)))
+        score = np.where(np.isfinite(score), score, np.inf).max(axis=1)
+        score[crossing.any(axis=1)] = np.inf
+
+        width = np.diff(np.log10(omega))
+        flagged = np.flatnonzero((score > 1) & (width > min_decades))
+        if flagged.size == 0:
+            break
+        # Budget limité : on raffine d'abord les intervalles les plus mal résolus
+        budget = max_points - omega.size
+        if flagged.size > budget:
+            flagged = flagged[np.argsort(-score[flagged], kind='stable')[:budget]]
+
+        new = np.sqrt(omega[flagged] * omega[flagged + 1])
+        H_new = evaluate(new)
+        order = np.argsort(np.concatenate([omega, new]), kind='stable')
+        omega = np.concatenate([omega, new])[order]
+        H = np.concatenate([H, H_new])[order]
+    return omega, H
+
+
+def tf_frequency_response(num, den, frequency_range=None, max_points=2000, **options):
+    """
+    Réponse fréquentielle adaptative d'une fonction de transfert num/den
+    frequency_range : exposants log10 (min, max), None : déduite des pôles et zéros
+    Retourne omega, H(jω) complexe (T,)
+    """
+    poles, zeros = np.roots(np.atleast_1d(den)), np.roots(np.atleast_1d(num))
+    if frequency_range is None:
+        frequency_range = default_frequency_range(poles, zeros)
+    return adaptive_grid(tf_evaluator(num, den), frequency_range,
+                         seeds=_seed_frequencies(poles, zeros, frequency_range),
+                         max_points=max_points, **options)
+
+
+def ss_frequency_response(A, B, C, D, frequency_range=None, max_points=2000, **options):
+    """
+    Réponse fréquentielle adaptative d'une représentation d'état
+    Retourne omega, H(jω) complexe (T, p, m)
+    """
+    poles = np.linalg.eigvals(np.atleast_2d(np.asarray(A, dtype=float)))
+    if frequency_range is None:
+        frequency_range = default_frequency_range(poles)
+    return adaptive_grid(ss_evaluator(A, B, C, D), frequency_range,
+                         seeds=_seed_frequencies(poles, (), frequency_range),
+                         max_points=max_points, **options)
+
+
+def system_frequency_response(system, frequency_range=None, max_points=2000, **options):
+    """
+    Réponse fréquentielle adaptative d'un objet python-control (TransferFunction ou StateSpace)
+    Retourne omega, gain, phase (rad, déroulée) ; (T,) pour un système SISO, (p, m, T) sinon
+    """
+    if isinstance(system, ctrl.TransferFunction) and system.ninputs == 1 and system.noutputs == 1:
+        omega, H = tf_frequency_response(system.num[0][0], system.den[0][0],
+                                         frequency_range, max_points, **options)
+    else:
+        system = ctrl.ss(system)
+        omega, H = ss_frequency_response(system.A, system.B, system.C, system.D,
+                                         frequency_range, max_points, **options)
+        H = np.moveaxis(H, 0, -1)
+        if H.shape[:2] == (1, 1):
+            H = H[0, 0]
+    return omega, np.abs(H), np.unwrap(np.angle(H), axis=-1)
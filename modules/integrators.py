@@ -0,0 +1,111 @@
+import numpy as np
+
+# Intégrateurs à pas fixe, sans appel à solve_ivp : résultats reproductibles bit à bit
+FIXED_STEP_METHODS = ('rk4', 'euler_si', 'dopri5')
+
+# Tableau de Butcher de Dormand-Prince 5(4)
+_DP_C = np.array([0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1])
+_DP_A = [
+    [],
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+]
+_DP_B = np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84])
+
+# Sortie dense d'ordre 4 : y(t + θh) = y + h Σ_j (K^T P)[:, j] θ^{j+1}
+_DP_P = np.array([
+    [1, -8048581381 / 2820520608, 8663915743 / 2820520608, -12715105075 / 11282082432],
+    [0, 0, 0, 0],
+    [0, 131558114200 / 32700410799, -68118460800 / 10900136933, 87487479700 / 32700410799],
+    [0, -1754552775 / 470086768, 14199869525 / 1410260304, -10690763975 / 1880347072],
+    [0, 127303824393 / 49829197408, -318862633887 / 49829197408, 701980252875 / 199316789632],
+    [0, -282668133 / 205662961, 2019193451 / 616988883, -1453857185 / 822651844],
+    [0, 40617522 / 29380423, -110615467 / 29380423, 69997945 / 29380423],
+])
+
+
+def _rk4_step(fun, t, x, h, jac):
+    k1 = fun(t, x)
+    k2 = fun(t + h / 2, x + h / 2 * k1)
+    k3 = fun(t + h / 2, x + h / 2 * k2)
+    k4 = fun(t + h, x + h * k3)
+    return x + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+
+
+def _euler_si_step(fun, t, x, h, jac):
+    """
+    Euler semi-implicite (linéairement implicite) : (I - hJ) Δx = h f(x)
+    """
+    J = np.asarray(jac(t, x), dtype=float)
+    n = x.shape[0]
+    if x.ndim == 1 or J.ndim == 2:
+        return x + np.linalg.solve(np.eye(n) - h * J, h * fun(t, x))
+    # Lot (n, N) avec une Jacobienne par colonne (N, n, n)
+    rhs = (h * fun(t, x)).T[:, :, None]
+    return x + np.linalg.solve(np.eye(n) - h * J, rhs)[:, :, 0].T
+
+
+def _dopri5_stages(fun, t, x, h):
+    K = []
+    for c, a in zip(_DP_C, _DP_A):
+        dx = sum((h * a_j) * K[j] for j, a_j in enumerate(a)) if a else 0.0
+        K.append(fun(t + c * h, x + dx))
+    x_new = x + h * sum(b * k for b, k in zip(_DP_B, K) if b)
+    K.append(fun(t + h, x_new))
+    return x_new, K
+
+
+def integrate_fixed_step(fun, t_span, x0, t_eval=None, method='rk4', h=None, jac=None, n_points=500):
+    """
+    Intègre dx/dt = fun(t, x) à pas fixe.
+
+    x0 : état (n,) ou lot d'états empilés en colonnes (n, N) ; fun doit accepter la même forme
+    t_eval : instants de sortie réguliers (par défaut n_points points sur t_span)
+    method : 'rk4', 'euler_si' (nécessite jac(t, x)) ou 'dopri5' (sortie dense d'ordre 4)
+    h : pas d'intégration (par défaut l'écart entre deux instants de t_eval ;
+        pour rk4/euler_si il est ajusté pour tomber exactement sur t_eval)
+
+    Retourne t_eval et les états, de forme x0.shape + (T,)
+    """
+    if method not in FIXED_STEP_METHODS:
+        raise ValueError(f"Méthode à pas fixe inconnue : {method}")
+    if method == 'euler_si' and jac is None:
+        raise ValueError("La méthode 'euler_si' nécessite la Jacobienne (jac).")
+
+    t0, tf = float(t_span[0]), float(t_span[1])
+    t_eval = np.linspace(t0, tf, n_points) if t_eval is None else np.asarray(t_eval, dtype=float)
+    x = np.array(x0, dtype=float)
+    Y = np.empty(x.shape + (t_eval.size,))
+
+    if method == 'dopri5':
+        if h is None:
+            h = t_eval[1] - t_eval[0] if t_eval.size > 1 else tf - t0
+        n_steps = max(1, int(np.ceil((tf - t0) / h)))
+        h = (tf - t0) / n_steps
+        # Pas k contenant chaque instant de sortie (θ ∈ [0, 1] dans ce pas)
+        step_of = np.minimum(np.floor((t_eval - t0) / h).astype(int), n_steps - 1)
+        t, k_out = t0, 0
+        for k in range(n_steps):
+            x_new, K = _dopri5_stages(fun, t, x, h)
+            if k_out < t_eval.size and step_of[k_out] == k:
+                Q = np.tensordot(_DP_P.T, np.stack(K), axes=1)
+            while k_out < t_eval.size and step_of[k_out] == k:
+                theta = (t_eval[k_out] - t) / h
+                Y[..., k_out] = x + h * sum(Q[j] * theta ** (j + 1) for j in range(Q.shape[0]))
+                k_out += 1
+            x, t = x_new, t0 + (k + 1) * h
+        return t_eval, Y
+
+    step = _rk4_step if method == 'rk4' else _euler_si_step
+    Y[..., 0] = x
+    for k in range(1, t_eval.size):
+        dt = t_eval[k] - t_eval[k - 1]
+        substeps = max(1, int(np.ceil(dt / h))) if h else 1
+        hk = dt / substeps
+        for i in range(substeps):
+            x = step(fun, t_eval[k - 1] + i * hk, x, hk, jac)
+        Y[..., k] = x
+    return t_eval, Y
@@ -0,0 +1,165 @@
+import numpy as np
+from scipy.linalg import expm, solve_sylvester
+from scipy.integrate import solve_ivp
+from modules.integrators import FIXED_STEP_METHODS, integrate_fixed_step
+
+_PHI_CACHE = {}
+_PHI_CACHE_SIZE = 64
+
+
+def transition_matrix(A, dt):
+    """
+    Retourne la matrice de transition Φ = exp(A·dt), calculée une seule fois par couple (A, dt)
+    """
+    A = np.ascontiguousarray(A, dtype=float)
+    key = (A.shape, A.tobytes(), float(dt))
+    Phi = _PHI_CACHE.get(key)
+    if Phi is None:
+        if len(_PHI_CACHE) >= _PHI_CACHE_SIZE:
+            _PHI_CACHE.pop(next(iter(_PHI_CACHE)))
+        Phi = expm(A * dt)
+        _PHI_CACHE[key] = Phi
+    return Phi
+
+
+def propagate(A, x0, t):
+    """
+    Propage exactement dx/dt = Ax sur la grille t : x(t_{k+1}) = Φ x(t_k)
+
+    x0 : état initial (n,) ou lot d'états initiaux (N, n)
+    t  : instants d'échantillonnage (croissants)
+    Retourne un tableau (n, T) pour un seul x0, (N, n, T) pour un lot.
+    """
+    A = np.asarray(A, dtype=float)
+    x0 = np.asarray(x0, dtype=float)
+    t = np.asarray(t, dtype=float)
+    single = x0.ndim == 1
+    X0 = x0.reshape(1, -1) if single else x0
+
+    n, N, T = A.shape[0], X0.shape[0], t.size
+    steps = np.diff(t)
+    uniform = steps.size == 0 or np.allclose(steps, steps[0])
+
+    # Colonnes de Z groupées par instant : Z[:, k*N:(k+1)*N] = états au temps t_k
+    Z = np.empty((n, T * N))
+    Z[:, :N] = X0.T
+    if uniform and steps.size:
+        # Doublement : les instants [m, 2m) s'obtiennent d'un seul produit Φ^m @ Z[:, 0:m]
+        P = transition_matrix(A, steps[0])
+        m = 1
+        while m < T:
+            count = min(m, T - m)
+            Z[:, m * N:(m + count) * N] = P @ Z[:, :count * N]
+            m += count
+            if m < T:
+                P = P @ P
+    else:
+        for k in range(1, T):
+            Z[:, k * N:(k + 1) * N] = transition_matrix(A, steps[k - 1]) @ Z[:, (k - 1) * N:k * N]
+
+    Y = Z.reshape(n, T, N).transpose(2, 0, 1)
+    return Y[0] if single else Y
+
+
+def propagate_stack(Phi, z0, T):
+    """
+    Propage z_{k+1} = Φ_i z_k pour une pile de matrices de transition Φ (N, n, n)
+    z0 : états initiaux (N, n) ; T : nombre d'instants
+    Retourne un tableau (N, n, T)
+    """
+    Phi = np.asarray(Phi, dtype=float)
+    z0 = np.asarray(z0, dtype=float)
+    Z = np.empty(z0.shape + (T,))
+    Z[:, :, 0] = z0
+    # Même doublement que propagate, appliqué à toute la pile à la fois
+    P, m = Phi, 1
+    while m < T:
+        count = min(m, T - m)
+        Z[:, :, m:m + count] = P @ Z[:, :, :count]
+        m += count
+        if m < T:
+            P = P @ P
+    return Z
+
+
+def block_triangular_transition(F, G, H, dt):
+    """
+    Exponentielle de M = [[F, G], [0, H]] sur un pas dt, calculée sur deux problèmes n×n :
+        exp(M dt) = [[exp(F dt), X], [0, exp(H dt)]]
+    où X est solution de l'équation de Sylvester F X - X H = exp(F dt) G - G exp(H dt).
+    Si les spectres de F et H sont trop proches, l'exponentielle complète est utilisée.
+    Retourne (P11, P12, P22)
+    """
+    F, G, H = (np.asarray(M, dtype=float) for M in (F, G, H))
+    P11 = transition_matrix(F, dt)
+    P22 = transition_matrix(H, dt)
+    gap = np.abs(np.linalg.eigvals(F)[:, None] - np.linalg.eigvals(H)[None, :]).min()
+    if gap > 1e-6 * max(1.0, np.linalg.norm(F), np.linalg.norm(H)):
+        P12 = solve_sylvester(F, -H, P11 @ G - G @ P22)
+    else:
+        n = F.shape[0]
+        P12 = expm(np.block([[F, G], [np.zeros((H.shape[0], n)), H]]) * dt)[:n, n:]
+    return P11, P12, P22
+
+
+def propagate_block_triangular(P11, P12, P22, x0, e0, T):
+    """
+    Propage x_{k+1} = P11 x_k + P12 e_k, e_{k+1} = P22 e_k sur T instants
+    x0, e0 : (n,) ou lots (N, n) ; retourne (x, e) de forme (n, T) ou (N, n, T)
+    """
+    x0 = np.asarray(x0, dtype=float)
+    e0 = np.asarray(e0, dtype=float)
+    single = x0.ndim == 1
+    X0, E0 = (x0.reshape(1, -1), e0.reshape(1, -1)) if single else (x0, e0)
+    N = X0.shape[0]
+
+    Zx = np.empty((X0.shape[1], T * N))
+    Ze = np.empty((E0.shape[1], T * N))
+    Zx[:, :N], Ze[:, :N] = X0.T, E0.T
+    # Doublement en exploitant la structure triangulaire : 3 produits n×n au lieu d'un produit 2n×2n
+    m = 1
+    while m < T:
+        count = min(m, T - m)
+        Zx[:, m * N:(m + count) * N] = P11 @ Zx[:, :count * N] + P12 @ Ze[:, :count * N]
+        Ze[:, m * N:(m + count) * N] = P22 @ Ze[:, :count * N]
+        m += count
+        if m < T:
+            P12 = P11 @ P12 + P12 @ P22
+            P11, P22 = P11 @ P11, P22 @ P22
+
+    x = Zx.reshape(-1, T, N).transpose(2, 0, 1)
+    e = Ze.reshape(-1, T, N).transpose(2, 0, 1)
+    return (x[0], e[0]) if single else (x, e)
+
+
+def simulate_linear(A, x0, t_span, method='exact', n_points=500):
+    """
+    Simule dx/dt = Ax sur n_points instants réguliers :
+    - method='exact' : discrétisation exacte par exponentielle de matrice
+    - method='rk4', 'euler_si' ou 'dopri5' : intégrateur à pas fixe
+    - sinon : intégration par solve_ivp avec la méthode indiquée (ex: 'RK45')
+    x0 : état (n,) ou lot d'états (N, n) ; retourne t et (n, T) ou (N, n, T)
+    """
+    A = np.asarray(A, dtype=float)
+    x0 = np.asarray(x0, dtype=float)
+    t_eval = np.linspace(t_span[0], t_span[1], n_points)
+    if method == 'exact':
+        return t_eval, propagate(A, x0, t_eval)
+
+    def linear_dynamics(t, x):
+        return A @ x
+
+    if method in FIXED_STEP_METHODS:
+        t, Y = integrate_fixed_step(linear_dynamics, t_span, x0.T, t_eval, method=method,
+                                    jac=lambda t, x: A)
+        return t, Y if x0.ndim == 1 else Y.transpose(1, 0, 2)
+
+    if x0.ndim == 1:
+        sol = solve_ivp(linear_dynamics, t_span, x0, method=method, t_eval=t_eval)
+        return sol.t, sol.y
+
+    # Lot : les N états sont intégrés ensemble comme un seul état empilé (n, N)
+    N, n = x0.shape
+    sol = solve_ivp(lambda t, y: (A @ y.reshape(n, N)).ravel(), t_span, x0.T.ravel(),
+                    method=method, t_eval=t_eval)
+    return sol.t, sol.y.reshape(n, N, -1).transpose(1, 0, 2)
@@ -1,17 +1,104 @@
+import os
 import numpy as np
-import sympy as sp
-from sympy.utilities.lambdify import lambdify
+from functools import cached_property
 from scipy.integrate import solve_ivp
+from scipy.sparse import csc_matrix
+from scipy.stats import qmc
+from concurrent.futures import ProcessPoolExecutor
+from modules.integrators import FIXED_STEP_METHODS, integrate_fixed_step
+from modules.expression_cache import compile_dynamics, compile_jacobian, compile_lyapunov
+
+STIFF_METHODS = ('Radau', 'BDF', 'LSODA')
+
+
+def _evaluate_entries(func, X, shape):
+    """
+    Évalue une fonction lambdifiée (liste d'expressions) sur un lot de points X (N, n)
+    et renvoie un tableau (N,) + shape ; les entrées constantes sont diffusées.
+    """
+    X = np.asarray(X, dtype=float)
+    values = func(*X.T)
+    out = np.empty((X.shape[0], len(values)))
+    for i, v in enumerate(values):
+        out[:, i] = v
+    return out.reshape((X.shape[0],) + shape)
+
+
+def _sample_box(bounds, sampling, resolution, n_samples, chunk_size, seed=None):
+    """
+    Génère par blocs (k, d) des points de la boîte `bounds` :
+    grille régulière (resolution points par axe) ou suite de Sobol brouillée (n_samples points)
+    """
+    lo = np.array([b[0] for b in bounds], dtype=float)
+    hi = np.array([b[1] for b in bounds], dtype=float)
+    d = len(bounds)
+    if sampling == 'grid':
+        axes = [np.linspace(l, h, resolution) for l, h in zip(lo, hi)]
+        total = resolution ** d
+        for start in range(0, total, chunk_size):
+            idx = np.unravel_index(np.arange(start, min(start + chunk_size, total)), (resolution,) * d)
+            yield np.column_stack([axes[i][idx[i]] for i in range(d)])
+    elif sampling == 'sobol':
+        sampler = qmc.Sobol(d, scramble=True, seed=seed)
+        for start in range(0, n_samples, chunk_size):
+            yield qmc.scale(sampler.random(min(chunk_size, n_samples - start)), lo, hi)
+    else:
+        raise ValueError(f"Échantillonnage inconnu : {sampling}")
+
+
+def _evaluate_scalar(func, X):
+    # Une expression constante renvoie un scalaire : on la diffuse sur le lot
+    return np.broadcast_to(np.asarray(func(*X.T), dtype=float), (X.shape[0],))
+
+
+def classify_equilibrium(eigenvalues, tol=1e-9):
+    """
+    Nature d'un point d'équilibre d'après les valeurs propres de sa linéarisation
+    """
+    re = np.real(eigenvalues)
+    oscillating = np.any(np.abs(np.imag(eigenvalues)) > tol)
+    if np.any(np.abs(re) <= tol):
+        return "centre" if np.all(np.abs(re) <= tol) and oscillating else "non hyperbolique"
+    if np.all(re < 0):
+        return "foyer stable" if oscillating else "nœud stable"
+    if np.all(re > 0):
+        return "foyer instable" if oscillating else "nœud instable"
+    return "selle"
+
 
 class NonlinearSystem:
-    def __init__(self, state_vars, dynamics_exprs):
+    def __init__(self, state_vars, dynamics_exprs, cse=False):
         """
         state_vars: liste de symboles (ex: [x1, x2])
         dynamics_exprs: liste d'expressions symboliques (ex: [x2, -x1 + (1 - x1**2)*x2])
+        cse: élimination des sous-expressions communes lors de la compilation de la Jacobienne
+
+        Les fonctions compilées proviennent du cache partagé (modules.expression_cache) :
+        un modèle déjà rencontré n'est pas recompilé.
         """
         self.x = state_vars
         self.f = dynamics_exprs
-        self.f_func = lambdify(self.x, self.f, modules='numpy')
+        self.cse = cse
+        self.f_func = compile_dynamics(self.x, self.f)["f"]
+
+    @cached_property
+    def _compiled_jacobian(self):
+        # Dérivée et compilée à la première demande (entrée distincte du cache partagé)
+        return compile_jacobian(self.x, self.f, self.cse)
+
+    @property
+    def jacobian(self):
+        """
+        Jacobienne symbolique ∂f/∂x (calculée une seule fois)
+        """
+        return self._compiled_jacobian["J"]
+
+    @property
+    def jacobian_func(self):
+        """
+        Jacobienne compilée : renvoie la liste aplatie des n×n entrées
+        """
+        return self._compiled_jacobian["jacobian"]
 
     def evaluate_dynamics(self, x_vals):
         return np.array(self.f_func(*x_vals), dtype=float)
@@ -19,28 +106,248 @@ class NonlinearSystem:
     def linearize_at(self, eq_point):
         """
         Linéarise autour d'un point d'équilibre : retourne la matrice Jacobienne évaluée
+        eq_point : point (n,) -> matrice (n, n), ou lot de points (N, n) -> tableau (N, n, n)
         """
-        J = sp.Matrix(self.f).jacobian(self.x)
-        J_at_point = J.subs(zip(self.x, eq_point))
-        return np.array(J_at_point.evalf(), dtype=float)
+        points = np.asarray(eq_point, dtype=float)
+        n = len(self.x)
+        J = _evaluate_entries(self.jacobian_func, points.reshape(-1, n), (n, n))
+        return J[0] if points.ndim == 1 else J
 
-    def simulate(self, x0, t_span):
+    def _rhs(self, t, x):
+        """
+        Second membre vectorisé pour solve_ivp : x de forme (n,) ou (n, k).
+        Les composantes sont écrites dans un tableau alloué une fois par appel
+        (solve_ivp conserve les valeurs retournées, un tampon partagé n'est donc pas possible).
+        """
+        out = np.empty(np.shape(x))
+        for i, v in enumerate(self.f_func(*x)):
+            out[i] = v
+        return out
+
+    def _jac(self, t, x):
+        # x : (n,) -> (n, n) ; lot empilé (n, N) -> (N, n, n)
+        return self.linearize_at(np.transpose(x))
+
+    def simulate(self, x0, t_span, method='RK45', n_points=1000):
         """
         Simule numériquement le système non linéaire dx/dt = f(x)
+        method : méthode de solve_ivp ; pour les méthodes implicites (Radau, BDF, LSODA)
+                 la Jacobienne compilée est fournie au solveur.
+                 'rk4', 'euler_si', 'dopri5' : intégrateurs à pas fixe
         """
-        def dyn(t, x):
-            return self.evaluate_dynamics(x)
+        t_eval = np.linspace(t_span[0], t_span[1], n_points)
+        if method in FIXED_STEP_METHODS:
+            return integrate_fixed_step(self._rhs, t_span, x0, t_eval, method=method, jac=self._jac)
+
+        options = {}
+        if method in STIFF_METHODS:
+            options['jac'] = self._jac
 
-        sol = solve_ivp(dyn, t_span, x0, t_eval=np.linspace(t_span[0], t_span[1], 1000))
+        sol = solve_ivp(self._rhs, t_span, x0, method=method, vectorized=True,
+                        t_eval=t_eval, **options)
         return sol.t, sol.y
 
+    def simulate_ensemble(self, X0, t_span, method='RK45', n_points=1000, n_jobs=1, rtol=1e-3, atol=1e-6):
+        """
+        Simule un lot de conditions initiales X0 (N, n) en une seule intégration :
+        les N trajectoires forment un état empilé de dimension n·N.
+        n_jobs > 1 : le lot est découpé en blocs intégrés dans des processus séparés
+        (None : un bloc par cœur, os.cpu_count()).
+        rtol, atol : tolérances visées pour chaque trajectoire (valeurs par défaut de solve_ivp)
+
+        solve_ivp contrôle la norme RMS de l'erreur sur tout l'état empilé, ce qui dilue l'erreur
+        d'une trajectoire d'un facteur √N : les tolérances transmises au solveur sont donc divisées
+        par √N, de sorte que chaque trajectoire soit au moins aussi précise que simulée seule.
+        Le pas étant commun, les valeurs obtenues dépendent encore légèrement des autres
+        trajectoires du bloc (et donc de n_jobs), à l'intérieur de ces tolérances.
+        Retourne t (T,) et les trajectoires (N, n, T)
+        """
+        X0 = np.atleast_2d(np.asarray(X0, dtype=float))
+        if n_jobs is None:
+            n_jobs = os.cpu_count() or 1
+        if n_jobs != 1 and len(X0) > 1:
+            chunks = np.array_split(X0, min(len(X0), n_jobs))
+            k = len(chunks)
+            with ProcessPoolExecutor(max_workers=k) as executor:
+                parts = list(executor.map(_simulate_ensemble_chunk, [self.x] * k, [self.f] * k, chunks,
+                                          [t_span] * k, [method] * k, [n_points] * k, [rtol] * k, [atol] * k))
+            return parts[0][0], np.concatenate([Y for _, Y in parts])
+
+        N, n = X0.shape
+        if method in FIXED_STEP_METHODS:
+            t, Y = integrate_fixed_step(self._rhs, t_span, X0.T, np.linspace(t_span[0], t_span[1], n_points),
+                                        method=method, jac=self._jac)
+            return t, Y.transpose(1, 0, 2)
+
+        # État empilé : y[i*N + j] = composante i de la trajectoire j
+        def rhs(t, y):
+            return self._rhs(t, y.reshape(n, -1)).reshape(y.shape)
+
+        options = {}
+        if method in ('Radau', 'BDF'):
+            # Jacobienne diagonale par blocs (une matrice n×n par trajectoire), au format creux
+            rows = (np.arange(n)[:, None, None] * N + np.arange(N)).repeat(n, axis=1)
+            cols = (np.arange(n)[None, :, None] * N + np.arange(N)).repeat(n, axis=0)
+
+            def jac(t, y):
+                J = self.linearize_at(y.reshape(n, N).T)
+                return csc_matrix((J.transpose(1, 2, 0).ravel(), (rows.ravel(), cols.ravel())),
+                                  shape=(n * N, n * N))
+            options['jac'] = jac
+
+        # atol par composante (n,) : répété pour chaque trajectoire de l'état empilé
+        atol = np.repeat(atol, N) if np.ndim(atol) else atol
+        sol = solve_ivp(rhs, t_span, X0.T.ravel(), method=method, vectorized=True,
+                        t_eval=np.linspace(t_span[0], t_span[1], n_points),
+                        rtol=rtol / np.sqrt(N), atol=atol / np.sqrt(N), **options)
+        return sol.t, sol.y.reshape(n, N, -1).transpose(1, 0, 2)
+
     def check_lyapunov_function(self, V_expr):
         """
         Vérifie si V(x) est une fonction de Lyapunov candidate.
         Retourne :
             V(x), dV(x)/dt symboliquement
         """
-        V = sp.sympify(V_expr)
-        dVdx = [sp.diff(V, xi) for xi in self.x]
-        dVdt = sum(dVdx[i] * self.f[i] for i in range(len(self.x)))
-        return V, dVdt
+        compiled = compile_lyapunov(self.x, self.f, V_expr)
+        return compiled["V"], compiled["dVdt"]
+
+    def find_equilibria(self, bounds, n_starts=256, method='lm', tol=1e-10, max_iter=100,
+                        dedup_tol=1e-6, seed=None):
+        """
+        Recherche des points d'équilibre f(x) = 0 dans la boîte `bounds`.
+
+        n_starts points de départ (suite de Sobol) sont résolus simultanément par des itérations
+        vectorisées de Newton (method='newton') ou de Levenberg-Marquardt (method='lm')
+        utilisant la Jacobienne compilée ; les racines sont ensuite dédoublonnées.
+
+        Retourne une liste de dicts {point, eigenvalues, type, stable}
+        """
+        if method not in ('newton', 'lm'):
+            raise ValueError(f"Méthode inconnue : {method}")
+        d = len(self.x)
+        X = next(_sample_box(bounds, 'sobol', None, n_starts, n_starts, seed))
+        F = _evaluate_entries(self.f_func, X, (d,))
+        residual = np.linalg.norm(F, axis=1)
+        lam = np.full(len(X), 1e-3)
+        I = np.eye(d)
+
+        for _ in range(max_iter):
+            active = np.flatnonzero(np.isfinite(residual) & (residual > tol))
+            if active.size == 0:
+                break
+            J = self.linearize_at(X[active])
+            Jt = J.transpose(0, 2, 1)
+            # Newton (amortissement négligeable, seulement contre les Jacobiennes singulières)
+            # ou Levenberg-Marquardt (amortissement adaptatif par point de départ)
+            damping = np.full(active.size, 1e-12) if method == 'newton' else lam[active]
+            step = -np.linalg.solve(Jt @ J + damping[:, None, None] * I, Jt @ F[active][:, :, None])[:, :, 0]
+
+            X_new = X[active] + step
+            with np.errstate(all='ignore'):
+                F_new = _evaluate_entries(self.f_func, X_new, (d,))
+            r_new = np.linalg.norm(F_new, axis=1)
+            accept = np.isfinite(r_new) & ((r_new < residual[active]) | (method == 'newton'))
+            rows = active[accept]
+            X[rows], F[rows], residual[rows] = X_new[accept], F_new[accept], r_new[accept]
+            lam[rows] /= 3
+            lam[active[~accept]] *= 2
+
+        lo = np.array([b[0] for b in bounds], dtype=float)
+        hi = np.array([b[1] for b in bounds], dtype=float)
+        margin = dedup_tol * (1 + np.abs(hi - lo))
+        found = (residual <= tol) & np.all((X >= lo - margin) & (X <= hi + margin), axis=1)
+
+        roots = []
+        for x in X[found]:
+            if not any(np.linalg.norm(x - r) <= dedup_tol * (1 + np.linalg.norm(r)) for r in roots):
+                roots.append(x)
+
+        equilibria = []
+        for x in roots:
+            eig = np.linalg.eigvals(self.linearize_at(x))
+            equilibria.append({
+                "point": x,
+                "eigenvalues": eig,
+                "type": classify_equilibrium(eig),
+                "stable": bool(np.all(np.real(eig) < 0)),
+            })
+        return equilibria
+
+    def verify_lyapunov(self, V_expr, bounds, sampling='grid', resolution=101, n_samples=2 ** 16,
+                        equilibrium=None, exclude_radius=1e-6, chunk_size=100_000,
+                        max_violations=1000, seed=None):
+        """
+        Vérifie numériquement les conditions de Lyapunov V > 0 et dV/dt < 0 sur la boîte `bounds`
+        (liste de couples (min, max)), hors d'une petite boule autour de l'équilibre.
+
+        sampling : 'grid' (resolution points par axe) ou 'sobol' (n_samples points quasi-aléatoires)
+        Les points sont traités par blocs de chunk_size pour borner la mémoire.
+
+        Retourne un dict :
+            n_points, n_violations (dV/dt >= 0), n_nonpositive (V <= 0)
+            violations : au plus max_violations points en défaut
+            worst_point, worst_dVdt : point où dV/dt est maximal
+            certified_level : plus grand c tel qu'aucun point échantillonné de {V < c} ne soit en défaut
+                              et que {V < c} ne touche pas le bord de la boîte ; 0 si {V < c} ne
+                              contient aucun point échantillonné hors de la boule exclue
+            certified : True si certified_level > 0
+        """
+        compiled = compile_lyapunov(self.x, self.f, V_expr)
+        V_func, dVdt_func = compiled["V_func"], compiled["dVdt_func"]
+        d = len(self.x)
+        x_eq = np.zeros(d) if equilibrium is None else np.asarray(equilibrium, dtype=float)
+
+        n_points = n_violations = n_nonpositive = 0
+        violations = []
+        worst_point, worst_dVdt = None, -np.inf
+        level = v_min = np.inf
+
+        for X in _sample_box(bounds, sampling, resolution, n_samples, chunk_size, seed):
+            keep = np.linalg.norm(X - x_eq, axis=1) > exclude_radius
+            X = X[keep]
+            V = _evaluate_scalar(V_func, X)
+            dV = _evaluate_scalar(dVdt_func, X)
+            bad = (dV >= 0) | (V <= 0)
+
+            n_points += len(X)
+            if len(V):
+                v_min = min(v_min, V.min())
+            n_violations += int(np.count_nonzero(dV >= 0))
+            n_nonpositive += int(np.count_nonzero(V <= 0))
+            if bad.any():
+                level = min(level, V[bad].min())
+                if len(violations) < max_violations:
+                    violations.extend(X[bad][:max_violations - len(violations)])
+            if len(dV) and dV.max() > worst_dVdt:
+                k = np.argmax(dV)
+                worst_point, worst_dVdt = X[k], dV[k]
+
+        # Le sous-niveau certifié doit rester dans la boîte : min de V sur chaque face
+        for i, (lo, hi) in enumerate(bounds):
+            face_bounds = [b for j, b in enumerate(bounds) if j != i]
+            for value in (lo, hi):
+                faces = _sample_box(face_bounds, sampling, resolution, max(256, n_samples // (2 * d)),
+                                    chunk_size, seed) if face_bounds else [np.empty((1, 0))]
+                for F in faces:
+                    X = np.insert(F, i, value, axis=1)
+                    level = min(level, _evaluate_scalar(V_func, X).min())
+
+        # Sous-niveau sans point échantillonné hors de la boule exclue : rien n'est vérifié
+        if level <= v_min:
+            level = 0.0
+        return {
+            "n_points": n_points,
+            "n_violations": n_violations,
+            "n_nonpositive": n_nonpositive,
+            "violations": np.array(violations).reshape(-1, d),
+            "worst_point": worst_point,
+            "worst_dVdt": worst_dVdt,
+            "certified_level": max(level, 0.0),
+            "certified": bool(level > 0),
+        }
+
+
+def _simulate_ensemble_chunk(state_vars, dynamics_exprs, X0, t_span, method, n_points, rtol, atol):
+    # Exécuté dans un processus séparé : les fonctions lambdifiées ne sont pas transmissibles
+    return NonlinearSystem(state_vars, dynamics_exprs).simulate_ensemble(X0, t_span, method, n_points,
+                                                                         rtol=rtol, atol=atol)
@@ -0,0 +1,165 @@
+"""
+Critère de Nyquist sans tracé :
+- contour de Nyquist (demi-plan droit) parcouru dans le sens horaire, avec des indentations
+  en demi-cercle autour des pôles de la boucle ouverte situés sur l'axe imaginaire
+- grille adaptative sur l'axe jω (modules.frequency_response.adaptive_grid) pour que la
+  phase de 1 + L(s) soit résolue entre deux points consécutifs
+- comptage des tours de 1 + L autour de 0 (= tours de L autour de -1), puis Z = N + P
+- distance minimale au point -1 : min |1 + L(jω)| = 1/Ms, calculée exactement
+
+Les coefficients étant réels, le contour est symétrique : la variation d'argument sur la
+moitié inférieure est égale à celle de la moitié supérieure (de 0 à +j∞ puis l'arc jusqu'à +∞).
+Pour un lot de gains PID, le dénominateur s·den est commun : le contour est le même pour
+tous les candidats, évalués ensemble sur une grille partagée. Les racines en s = 0 communes
+à tous les numérateurs et au dénominateur (facteur s d'un PID sans action intégrale) sont
+simplifiées avant l'analyse : contour, comptage des tours et distance à -1 portent sur la
+boucle réduite.
+"""
+
+import numpy as np
+from modules.frequency_response import adaptive_grid, default_frequency_range
+from modules.stability_margins import cancel_origin, margins_batch
+
+NYQUIST_DTYPE = [("encirclements", int), ("open_loop_rhp_poles", int),
+                 ("closed_loop_rhp_poles", int), ("stable", bool), ("min_distance", float)]
+
+_ARC_POINTS = 129
+# Seule la phase de 1 + L compte pour le comptage des tours : pas de critère sur le gain
+_GRID_OPTIONS = {"db_tol": np.inf, "phase_tol": 30.0}
+
+
+def _imaginary_axis_poles(poles):
+    # Pulsations ω ≥ 0 des pôles situés sur l'axe imaginaire (une seule fois par paire conjuguée)
+    on_axis = np.abs(poles.real) <= 1e-9 * np.maximum(1.0, np.abs(poles))
+    w = np.abs(poles[on_axis].imag)
+    return np.unique(np.round(w[w >= 0], 12))
+
+
+def _upper_contour(evaluate, den, frequency_range, max_points):
+    """
+    Demi-contour supérieur : de 0 (ou d'une indentation autour de l'origine) jusqu'à +jR
+    en contournant les pôles jω_k par la droite, puis l'arc de rayon R jusqu'à +R.
+    evaluate(s) -> valeurs (T, ...) de 1 + L(s)
+    Retourne (s, F, mask_axis) : points du contour, valeurs de 1 + L, points sur l'axe jω
+    """
+    poles = np.roots(den)
+    if frequency_range is None:
+        frequency_range = default_frequency_range(poles)
+    lo, hi = frequency_range
+    w_axis = _imaginary_axis_poles(poles)
+    R = max(10.0 ** hi, 100 * w_axis.max(initial=0.0))
+    theta = np.linspace(0, np.pi / 2, _ARC_POINTS)
+
+    pieces = []
+    if w_axis.size and w_axis[0] == 0:
+        # Quart de cercle autour de l'origine, de +ε à +jε
+        eps = 10.0 ** lo / 100
+        pieces.append((eps * np.exp(1j * theta), False))
+        start, w_axis = eps, w_axis[1:]
+    else:
+        pieces.append((np.zeros(1, dtype=complex), True))
+        start = 10.0 ** lo
+
+    budget = max(max_points // (w_axis.size + 1), 16)
+    grid = lambda w: evaluate(1j * w)
+    for wk in w_axis:
+        eps = 1e-6 * wk
+        omega, _ = adaptive_grid(grid, (np.log10(start), np.log10(wk - eps)), max_points=budget,
+                                 **_GRID_OPTIONS)
+        pieces.append((1j * omega, True))
+        # Demi-cercle à droite du pôle jω_k, de jω_k - jε à jω_k + jε
+        pieces.append((1j * wk + eps * np.exp(1j * np.linspace(-np.pi / 2, np.pi / 2, _ARC_POINTS)), False))
+        start = wk + eps
+    omega, _ = adaptive_grid(grid, (np.log10(start), np.log10(R)), max_points=budget, **_GRID_OPTIONS)
+    pieces.append((1j * omega, True))
+    # Grand arc de +jR à +R
+    pieces.append((R * np.exp(1j * theta[::-1]), False))
+
+    s = np.concatenate([p for p, _ in pieces])
+    mask = np.concatenate([np.full(p.size, on_axis) for p, on_axis in pieces])
+    return s, evaluate(s), mask
+
+
+def _nyquist(num, den, frequency_range=None, max_points=2000):
+    """
+    Analyse de Nyquist d'un lot de numérateurs num (N, k) partageant le dénominateur den
+    Retourne (tableau structuré (N,), s, L(s) (T, N), masque des points sur l'axe jω)
+    """
+    num = np.atleast_2d(np.asarray(num, dtype=float))
+    den = np.trim_zeros(np.atleast_1d(np.asarray(den, dtype=float)), 'f')
+    # Racine commune en s = 0 : même simplification pour tout le lot (dénominateur partagé)
+    _, den_reduced = cancel_origin(num.any(axis=0).astype(float), den)
+    k = den.size - den_reduced.size
+    if k:
+        num, den = num[:, :num.shape[1] - k], den_reduced
+
+    def one_plus_L(s):
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            Nv = np.zeros((s.size, num.shape[0]), dtype=complex)
+            for coeff in num.T:
+                Nv = Nv * s[:, None] + coeff
+            return 1 + Nv / np.polyval(den, s)[:, None]
+
+    s, F, mask = _upper_contour(one_plus_L, den, frequency_range, max_points)
+
+    # Variation d'argument de 1 + L sur le demi-contour, doublée par symétrie
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dphi = np.angle(F[1:] / F[:-1])
+    turns = 2 * np.nansum(dphi, axis=0) / (2 * np.pi)
+    encirclements = -np.rint(turns).astype(int)      # tours dans le sens horaire
+
+    poles = np.roots(den)
+    P = int(np.count_nonzero(poles.real > 1e-9 * np.maximum(1.0, np.abs(poles))))
+    margins = margins_batch(num, np.broadcast_to(den, (num.shape[0], den.size)))
+
+    out = np.empty(num.shape[0], dtype=NYQUIST_DTYPE)
+    out["encirclements"] = encirclements
+    out["open_loop_rhp_poles"] = P
+    out["closed_loop_rhp_poles"] = encirclements + P
+    out["min_distance"] = 1.0 / margins["peak_sensitivity"]
+    out["stable"] = (out["closed_loop_rhp_poles"] == 0) & (out["min_distance"] > 1e-9)
+    return out, s, F - 1, mask
+
+
+def nyquist_analysis(num, den, frequency_range=None, max_points=2000):
+    """
+    Critère de Nyquist pour la boucle ouverte L = num/den
+
+    Retourne un dict :
+        omega, L : réponse L(jω) sur la grille adaptative (ω ≥ 0, hors indentations)
+        contour, L_contour : contour complet (sens horaire) et son image par L
+        encirclements : nombre de tours de L autour de -1 (sens horaire)
+        open_loop_rhp_poles : P, pôles instables de la boucle ouverte
+        closed_loop_rhp_poles : Z = N + P
+        stable : verdict de stabilité en boucle fermée
+        min_distance : distance minimale de L(jω) au point -1
+    """
+    result, s, L, mask = _nyquist(num, den, frequency_range, max_points)
+    L = L[:, 0]
+    # Contour complet : moitié inférieure (conjuguée, parcourue en sens inverse) puis supérieure
+    contour = np.concatenate([np.conj(s[::-1]), s])
+    L_contour = np.concatenate([np.conj(L[::-1]), L])
+    analysis = {name: result[name][0] for name, _ in NYQUIST_DTYPE}
+    analysis.update({"omega": s[mask].imag, "L": L[mask], "contour": contour, "L_contour": L_contour})
+    return analysis
+
+
+def pid_nyquist_batch(num, den, Kp, Ki, Kd, frequency_range=None, max_points=4000, chunk_size=64):
+    """
+    Critère de Nyquist de la boucle PID·G pour un lot de gains (Kp, Ki, Kd diffusés ensemble)
+    Les candidats sont traités par blocs de chunk_size, chaque bloc partageant sa grille adaptative ;
+    les candidats sans action intégrale (Ki = 0) forment des blocs à part, de boucle réduite
+    (Kd s + Kp)·num / den.
+    Retourne un tableau structuré (N,) de type NYQUIST_DTYPE
+    """
+    Kp, Ki, Kd = (np.ravel(g).astype(float) for g in np.broadcast_arrays(Kp, Ki, Kd))
+    num = np.atleast_1d(np.asarray(num, dtype=float))
+    num_ol = np.stack([np.convolve([kd, kp, ki], num) for kp, ki, kd in zip(Kp, Ki, Kd)])
+    den_ol = np.polymul([1.0, 0.0], den)
+
+    out = np.empty(len(num_ol), dtype=NYQUIST_DTYPE)
+    for rows in (np.flatnonzero(Ki != 0), np.flatnonzero(Ki == 0)):
+        for i in range(0, rows.size, chunk_size):
+            chunk = rows[i:i + chunk_size]
+            out[chunk] = _nyquist(num_ol[chunk], den_ol, frequency_range, max_points)[0]
+    return out
@@ -1,6 +1,7 @@
 import numpy as np
 from scipy.signal import place_poles
-from scipy.integrate import solve_ivp
+from modules.lti_propagation import simulate_linear, block_triangular_transition, propagate_block_triangular
+from modules.state_feedback import place_poles_batch
 
 class OutputFeedbackSystem:
     def __init__(self, A, B, C):
@@ -20,12 +21,19 @@ class OutputFeedbackSystem:
         self.L = result.gain_matrix.T
         return self.L
 
-    def simulate_output_feedback(self, x0, xhat0, t_span):
+    def compute_observer_gain_batch(self, poles_batch, n_jobs=1):
         """
-        Simule le système avec retour de sortie :
-        dx/dt = Ax + Bu
-        dẋ̂/dt = A x̂ + B u + L(y - C x̂)
-        u = -K x̂
+        Gains d'observateur pour un lot de jeux de pôles (N, n), par dualité (Aᵀ, Cᵀ),
+        sans modifier self.L
+        Retourne un dict {"L": (N, n, p), "metrics": tableau structuré}
+        """
+        result = place_poles_batch(self.A.T, self.C.T, poles_batch, n_jobs=n_jobs)
+        return {"L": result["K"].transpose(0, 2, 1), "metrics": result["metrics"]}
+
+    def closed_loop_matrix(self):
+        """
+        Matrice du système augmenté z = [x; x̂] :
+        dz/dt = [[A, -BK], [LC, A - BK - LC]] z
         """
         if not hasattr(self, 'K') or not hasattr(self, 'L'):
             raise ValueError("Gains K et L doivent être définis.")
@@ -35,18 +43,66 @@ class OutputFeedbackSystem:
         C = self.C
         K = self.K
         L = self.L
+        return np.block([[A, -B @ K], [L @ C, A - B @ K - L @ C]])
 
-        def dynamics(t, z):
-            x = z[:self.n]
-            x_hat = z[self.n:]
-            y = C @ x
-            
-            y_hat = C @ x_hat
-            u = -K @ x_hat
-            dx = A @ x + B @ u
-            dx_hat = A @ x_hat + B @ u + L @ (y - y_hat)
-            return np.concatenate((dx, dx_hat))
-
-        z0 = np.concatenate((x0, xhat0))
-        sol = solve_ivp(dynamics, t_span, z0, t_eval=np.linspace(t_span[0], t_span[1], 500))
-        return sol.t, sol.y[:self.n], sol.y[self.n:]
+    def simulate_output_feedback(self, x0, xhat0, t_span, method='exact'):
+        """
+        Simule le système avec retour de sortie :
+        dx/dt = Ax + Bu
+        dẋ̂/dt = A x̂ + B u + L(y - C x̂)
+        u = -K x̂
+        method : 'exact' (exponentielle de la matrice augmentée), 'rk4', 'euler_si', 'dopri5'
+                 ou méthode de solve_ivp (ex: 'RK45')
+        """
+        z0 = np.concatenate((np.asarray(x0, dtype=float), np.asarray(xhat0, dtype=float)))
+        t, z = simulate_linear(self.closed_loop_matrix(), z0, t_span, method)
+        return t, z[:self.n], z[self.n:]
+
+    def simulate_output_feedback_batch(self, X0, Xhat0, t_span, method='exact'):
+        """
+        Simule un lot de couples (x0, x̂0) : X0 et Xhat0 de forme (N, n)
+        Retourne t (T,), les états réels et estimés (N, n, T)
+        """
+        Z0 = np.hstack((np.atleast_2d(np.asarray(X0, dtype=float)),
+                        np.atleast_2d(np.asarray(Xhat0, dtype=float))))
+        t, Z = simulate_linear(self.closed_loop_matrix(), Z0, t_span, method)
+        return t, Z[:, :self.n], Z[:, self.n:]
+
+    def simulate_estimation_error(self, x0, xhat0, t_span, n_points=500):
+        """
+        Simulation en coordonnées (x, e = x - x̂) (principe de séparation) :
+        dx/dt = (A - BK) x + BK e
+        de/dt = (A - LC) e
+        La structure triangulaire par blocs ramène le calcul à deux exponentielles n×n.
+        x0, xhat0 : (n,) ou lots (N, n)
+        Retourne t, x, x̂ et l'erreur d'estimation e
+        """
+        if not hasattr(self, 'K') or not hasattr(self, 'L'):
+            raise ValueError("Gains K et L doivent être définis.")
+
+        x0 = np.asarray(x0, dtype=float)
+        e0 = x0 - np.asarray(xhat0, dtype=float)
+        t = np.linspace(t_span[0], t_span[1], n_points)
+        BK = self.B @ self.K
+        P11, P12, P22 = block_triangular_transition(self.A - BK, BK, self.A - self.L @ self.C, t[1] - t[0])
+        x, e = propagate_block_triangular(P11, P12, P22, x0, e0, t.size)
+        return t, x, x - e, e
+
+    def estimation_error_metrics(self, t, e, threshold=0.02):
+        """
+        Indicateurs de convergence de l'observateur à partir de l'erreur e (n, T) ou (N, n, T) :
+            decay_rate : abscisse spectrale de A - LC
+            initial_error, final_error : norme de e au début et à la fin
+            convergence_time : premier instant à partir duquel ||e|| reste sous threshold·||e(0)||
+        """
+        norm = np.linalg.norm(e, axis=-2)
+        initial, final = norm[..., 0], norm[..., -1]
+        above = norm > threshold * initial[..., None]
+        last = above.shape[-1] - 1 - np.argmax(above[..., ::-1], axis=-1)
+        convergence_time = np.where(above.any(axis=-1), t[np.minimum(last + 1, t.size - 1)], t[0])
+        return {
+            "decay_rate": np.linalg.eigvals(self.A - self.L @ self.C).real.max(),
+            "initial_error": initial,
+            "final_error": final,
+            "convergence_time": convergence_time,
+        }
@@ -1,14 +1,31 @@
+import time
 import numpy as np
 import control as ctrl
+from concurrent.futures import ProcessPoolExecutor
+from scipy.optimize import differential_evolution
 from scipy import signal
+from scipy.linalg import expm
+from modules.lti_propagation import propagate_stack
+from modules.frequency_response import tf_frequency_response
+from modules.stability_margins import stability_margins, pid_stability_margins, cancel_origin
+from modules.nyquist import nyquist_analysis, pid_nyquist_batch
+from modules.discrete_pid import DiscretePID, simulate_sampled_loop
 import matplotlib.pyplot as plt  # facultatif pour affichage des courbes
 
+METRICS_DTYPE = [("Kp", float), ("Ki", float), ("Kd", float), ("stable", bool),
+                 ("rise_time", float), ("overshoot", float), ("settling_time", float),
+                 ("IAE", float), ("ISE", float), ("ITAE", float)]
+
 class PIDModel:
     def __init__(self, num, den):
         """
         Initialise le système à partir de la fonction de transfert (numérateur, dénominateur)
         """
+        self.num = np.atleast_1d(np.array(num, dtype=float))
+        self.den = np.atleast_1d(np.array(den, dtype=float))
         self.sys = ctrl.TransferFunction(num, den)
+        # Résultats associés au jeu de gains courant (vidé par set_pid_gains)
+        self._results = {}
 
     def set_pid_gains(self, Kp, Ki, Kd):
         """
@@ -16,17 +33,39 @@ class PIDModel:
         """
         s = ctrl.TransferFunction.s
         self.pid = Kp + Ki / s + Kd * s
+        self.gains = (float(Kp), float(Ki), float(Kd))
+        self._results = {}
         return self.pid
 
+    def _cached(self, name, compute):
+        if not hasattr(self, 'pid'):
+            raise ValueError("PID non défini. Utiliser set_pid_gains().")
+        if name not in self._results:
+            self._results[name] = compute()
+        return self._results[name]
+
+    @property
+    def open_loop(self):
+        """
+        Fonction de transfert en boucle ouverte PID * système
+        """
+        return self._cached("open_loop", lambda: self.pid * self.sys)
+
+    @property
+    def closed_loop(self):
+        """
+        Fonction de transfert en boucle fermée (retour unitaire)
+        """
+        return self._cached("closed_loop", lambda: ctrl.feedback(self.open_loop, 1))
+
     def closed_loop_response(self):
         """
         Calcule la réponse en boucle fermée avec le PID actuel
         """
-        if not hasattr(self, 'pid'):
-            raise ValueError("PID non défini. Utiliser set_pid_gains().")
-        closed_loop = ctrl.feedback(self.pid * self.sys, 1)
-        t, y = ctrl.step_response(closed_loop)
-        return t, y
+        def compute():
+            t, y = ctrl.step_response(self.closed_loop)
+            return t, y
+        return self._cached("step", compute)
 
     def compute_tracking_error(self):
         """
@@ -36,38 +75,79 @@ class PIDModel:
         e = 1 - y
         return t, e
 
-    def bode_plot_data(self):
-        """Retourne les données pour tracer le diagramme de Bode sans erreur.
+    def poles(self):
+        """
+        Pôles de la fonction de transfert en boucle ouverte
+        """
+        return self._cached("poles", lambda: self.open_loop.poles())
 
-        On utilise `control.freqresp()` au lieu de `control.bode()` pour éviter tout conflit
-        avec Matplotlib (pas d'erreur liée à Plot).
+    def step_response_batch(self, Kp, Ki, Kd, T=None):
         """
-        if not hasattr(self, 'pid'):
-            raise ValueError("PID non défini.")
+        Réponses indicielles en boucle fermée pour des vecteurs de gains,
+        sans passer par les objets python-control (voir pid_step_response)
+        """
+        if T is None:
+            T = np.linspace(0, 20.0, 1000)
+        return pid_step_response(self.num, self.den, Kp, Ki, Kd, T)
 
-        system_open_loop = self.pid * self.sys
+    def open_loop_polynomials(self):
+        """
+        Numérateur et dénominateur de la boucle ouverte L(s) = (Kd s² + Kp s + Ki)·num / (s·den),
+        simplifiés par les racines communes en s = 0 (facteur s de trop si Ki = 0)
+        """
+        def compute():
+            Kp, Ki, Kd = self.gains
+            return cancel_origin(np.polymul([Kd, Kp, Ki], self.num), np.polymul([1.0, 0.0], self.den))
+        return self._cached("open_loop_polynomials", compute)
 
-        # Fréquence personnalisée de 0.01 à 100 rad/s (échelle log)
-        omega = np.logspace(-2, 2, 1000)
+    def bode_plot_data(self, frequency_range=None, max_points=2000):
+        """Retourne les données pour tracer le diagramme de Bode (omega, gain, phase en rad, déroulée).
 
-        # Calcul de la réponse fréquentielle complexe H(jω)
-        H = ctrl.freqresp(system_open_loop, omega)
+        La grille de fréquences est adaptative (modules.frequency_response) : plage déduite
+        des pôles et zéros de la boucle ouverte si frequency_range (exposants log10) vaut None.
+        """
+        def compute():
+            num_ol, den_ol = self.open_loop_polynomials()
+            omega, H = tf_frequency_response(num_ol, den_ol, frequency_range, max_points)
+            return omega, np.abs(H), np.unwrap(np.angle(H))
+        return self._cached(("bode", frequency_range, max_points), compute)
 
-        # Calcul magnitude et phase à partir de H(jω)
-        mag = np.abs(H)
-        phase = np.angle(H)
 
-        return omega, mag, phase
+    def stability_margins(self):
+        """
+        Marges de gain et de phase, marge de retard, pic de sensibilité Ms
+        et pulsations de coupure de la boucle ouverte (calcul exact par racines de polynômes)
+        """
+        return self._cached("margins", lambda: stability_margins(*self.open_loop_polynomials()))
 
+    def stability_margins_batch(self, Kp, Ki, Kd):
+        """
+        Marges de stabilité pour un lot de gains, sans modifier le PID courant
+        Retourne un tableau structuré (N,)
+        """
+        return pid_stability_margins(self.num, self.den, Kp, Ki, Kd)
+
+    def nyquist_analysis(self):
+        """
+        Critère de Nyquist de la boucle ouverte : nombre de tours autour de -1, pôles instables
+        en boucle ouverte et fermée, verdict de stabilité, distance minimale à -1
+        """
+        return self._cached("nyquist", lambda: nyquist_analysis(*self.open_loop_polynomials()))
+
+    def nyquist_batch(self, Kp, Ki, Kd):
+        """
+        Critère de Nyquist pour un lot de gains, sans modifier le PID courant
+        Retourne un tableau structuré (N,)
+        """
+        return pid_nyquist_batch(self.num, self.den, Kp, Ki, Kd)
 
     def nyquist_plot_data(self):
         """
-        Retourne les données pour tracer le diagramme de Nyquist
+        Retourne les données pour tracer le diagramme de Nyquist (ω de -∞ à +∞)
         """
-        if not hasattr(self, 'pid'):
-            raise ValueError("PID non défini.")
-        real, imag, freq = ctrl.nyquist(self.pid * self.sys, Plot=False)
-        return real, imag
+        L = self.nyquist_analysis()["L"]
+        L = np.concatenate([np.conj(L[::-1]), L])
+        return L.real, L.imag
 
     def ziegler_nichols_gains(self, Ku, Tu):
         """
@@ -82,3 +162,370 @@ class PIDModel:
         Ki = 2 * Kp / Tu
         Kd = Kp * Tu / 8
         return Kp, Ki, Kd
+
+    def to_discrete(self, Ts, N=10.0, method='tustin', u_min=None, u_max=None, anti_windup='clamping'):
+        """
+        PID discret équivalent au PID courant (dérivée filtrée Kd N s / (s + N), saturation,
+        anti-emballement), tel qu'il serait implanté sur le calculateur
+        """
+        if not hasattr(self, 'gains'):
+            raise ValueError("PID non défini. Utiliser set_pid_gains().")
+        return DiscretePID(*self.gains, Ts, N=N, method=method, u_min=u_min, u_max=u_max,
+                           anti_windup=anti_windup)
+
+    def simulate_discrete(self, Ts, t_final=20.0, reference=1.0, **options):
+        """
+        Simulation échantillonnée de la boucle fermée avec le PID discret (options de to_discrete)
+        Retourne un dict : t, y, u, e, fast_path, n_stepped
+        """
+        return simulate_sampled_loop(self.num, self.den, self.to_discrete(Ts, **options),
+                                     t_final=t_final, reference=reference)
+
+    def ultimate_gain(self):
+        """
+        Gain critique Ku et période d'oscillation Tu du procédé seul en régulation proportionnelle,
+        lus sur la réponse fréquentielle (passage de phase à -180°) ; (inf, nan) si ce passage n'existe pas
+        """
+        margins = stability_margins(self.num, self.den)
+        return margins["gain_margin"], 2 * np.pi / margins["phase_crossover"]
+
+    def autotune(self, **options):
+        """
+        Réglage automatique des gains (voir autotune_pid_gains) ; les gains trouvés
+        deviennent le PID courant
+        """
+        result = autotune_pid_gains(self.num, self.den, **options)
+        self.set_pid_gains(result["Kp"], result["Ki"], result["Kd"])
+        return result
+
+
+def step_metrics(t, Y, settling_band=0.02):
+    """
+    Indicateurs de réponse indicielle pour une ou plusieurs réponses Y (T,) ou (N, T)
+    Retourne un dict de tableaux (N,) :
+        rise_time (10 % -> 90 % de la valeur finale), overshoot (%), settling_time (bande ±2 %),
+        IAE = ∫|1 - y|dt, ISE = ∫(1 - y)²dt, ITAE = ∫t|1 - y|dt
+    """
+    t = np.asarray(t, dtype=float)
+    Y = np.atleast_2d(np.asarray(Y, dtype=float))
+    y_final = Y[:, -1]
+    idx = np.arange(Y.shape[0])
+
+    def first_crossing(level):
+        above = Y >= level[:, None]
+        k = np.argmax(above, axis=1)
+        return np.where(above[idx, k], t[k], np.nan)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rise_time = first_crossing(0.9 * y_final) - first_crossing(0.1 * y_final)
+        overshoot = np.maximum(0.0, (Y.max(axis=1) - y_final) / np.abs(y_final) * 100)
+
+        outside = np.abs(Y - y_final[:, None]) > settling_band * np.abs(y_final)[:, None]
+        last = Y.shape[1] - 1 - np.argmax(outside[:, ::-1], axis=1)
+        settling_time = np.where(outside.any(axis=1), t[np.minimum(last + 1, t.size - 1)], t[0])
+
+    e = 1 - Y
+    return {
+        "rise_time": rise_time,
+        "overshoot": overshoot,
+        "settling_time": settling_time,
+        "IAE": np.trapezoid(np.abs(e), t, axis=1),
+        "ISE": np.trapezoid(e ** 2, t, axis=1),
+        "ITAE": np.trapezoid(t * np.abs(e), t, axis=1),
+    }
+
+
+def pid_closed_loop_coefficients(num, den, Kp, Ki, Kd):
+    """
+    Coefficients de la boucle fermée PID * G / (1 + PID * G) pour des vecteurs de gains
+
+    Avec PID = (Kd s² + Kp s + Ki) / s et G = num / den :
+        numérateur   = (Kd s² + Kp s + Ki) num
+        dénominateur = s den + (Kd s² + Kp s + Ki) num
+    Retourne (num_cl, den_cl), deux tableaux (N, d+1) alignés (puissances décroissantes) ;
+    le coefficient dominant de den_cl peut être nul pour certains gains (ordre réduit).
+    """
+    num = np.trim_zeros(np.atleast_1d(np.asarray(num, dtype=float)), 'f')
+    den = np.trim_zeros(np.atleast_1d(np.asarray(den, dtype=float)), 'f')
+    gains = np.column_stack(np.broadcast_arrays(np.atleast_1d(Kd), np.atleast_1d(Kp),
+                                                np.atleast_1d(Ki))).astype(float)
+
+    # Produit (Kd s² + Kp s + Ki) * num pour tous les gains : matrice de convolution (3, len(num)+2)
+    conv = np.zeros((3, num.size + 2))
+    for i in range(3):
+        conv[i, i:i + num.size] = num
+    num_ol = gains @ conv
+    den_ol = np.append(den, 0.0)
+
+    L = max(num_ol.shape[1], den_ol.size)
+    num_cl = np.zeros((len(gains), L))
+    num_cl[:, L - num_ol.shape[1]:] = num_ol
+    den_cl = num_cl.copy()
+    den_cl[:, L - den_ol.size:] += den_ol
+
+    return num_cl, den_cl
+
+
+def companion_form(num_cl, den_cl):
+    """
+    Forme compagne (commandable) d'une pile de fonctions de transfert propres
+    Retourne A (N, n, n), B (n,), C (N, n), D (N,)
+    """
+    a = den_cl[:, 1:] / den_cl[:, :1]
+    b = num_cl / den_cl[:, :1]
+    N, n = a.shape
+    D = b[:, 0]
+    C = b[:, 1:] - D[:, None] * a
+    A = np.zeros((N, n, n))
+    A[:, 0, :] = -a
+    A[:, np.arange(1, n), np.arange(n - 1)] = 1.0
+    B = np.zeros(n)
+    if n:
+        B[0] = 1.0
+    return A, B, C, D
+
+
+def pid_step_response(num, den, Kp, Ki, Kd, T):
+    """
+    Réponses indicielles en boucle fermée pour N jeux de gains en un seul appel vectorisé :
+    coefficients -> forme compagne -> discrétisation exacte (bloqueur d'ordre zéro,
+    exacte pour un échelon) sur la grille régulière T.
+
+    T : instants croissants, régulièrement espacés et commençant à 0 (ValueError sinon)
+    Retourne (Y (N, len(T)), stable (N,))
+    """
+    T = np.asarray(T, dtype=float)
+    if T.ndim != 1 or T.size == 0 or T[0] != 0:
+        raise ValueError("T doit être un vecteur d'instants commençant à 0.")
+    dt = T[1] - T[0] if T.size > 1 else 0.0
+    if T.size > 1 and (dt <= 0 or not np.allclose(np.diff(T), dt, rtol=1e-6, atol=0)):
+        raise ValueError("T doit être une grille croissante de pas constant.")
+    num_cl, den_cl = pid_closed_loop_coefficients(num, den, Kp, Ki, Kd)
+    Y = np.empty((len(den_cl), T.size))
+    stable = np.empty(len(den_cl), dtype=bool)
+
+    # Les candidats sont regroupés par ordre effectif de la boucle fermée
+    lead = np.argmax(den_cl != 0, axis=1)
+    if np.any(np.all(den_cl == 0, axis=1)):
+        raise ValueError("Dénominateur de boucle fermée nul pour certains gains.")
+    for k in np.unique(lead):
+        rows = np.flatnonzero(lead == k)
+        if np.any(num_cl[rows, :k]):
+            raise ValueError("Boucle fermée impropre pour certains gains.")
+        Y[rows], stable[rows] = _step_response_group(num_cl[rows, k:], den_cl[rows, k:], dt, T.size)
+    return Y, stable
+
+
+def _step_response_group(num_cl, den_cl, dt, steps):
+    A, B, C, D = companion_form(num_cl, den_cl)
+    N, n = C.shape
+
+    # Stabilité : un facteur s commun (Ki = 0) est simplifié avant de tester les pôles
+    stable = np.ones(N, dtype=bool)
+    if n:
+        poles = np.linalg.eigvals(A)
+        cancel = (num_cl[:, -1] == 0) & (den_cl[:, -1] == 0)
+        at_origin = np.argmin(np.abs(poles), axis=1)
+        poles[np.flatnonzero(cancel), at_origin[cancel]] = -1.0
+        stable = np.all(poles.real < 0, axis=1)
+
+    # Système augmenté z = [x; u] avec u = 1 constant : exp([[A, B], [0, 0]] dt)
+    M = np.zeros((N, n + 1, n + 1))
+    M[:, :n, :n] = A
+    M[:, :n, n] = B
+    z0 = np.zeros((N, n + 1))
+    z0[:, n] = 1.0
+    Z = propagate_stack(expm(M * dt), z0, steps)
+    Y = np.einsum('ni,nit->nt', C, Z[:, :n]) + D[:, None]
+    return Y, stable
+
+
+def _pid_step_responses(num, den, gains, T):
+    """
+    Réponses indicielles en boucle fermée pour une liste de gains (N, 3)
+    Retourne (Y (N, T), stable (N,))
+    """
+    return pid_step_response(num, den, gains[:, 0], gains[:, 1], gains[:, 2], T)
+
+
+def _evaluate_gain_chunk(num, den, gains, T):
+    """
+    Évalue un bloc de gains et ne renvoie que les indicateurs (tableau structuré)
+    """
+    Y, stable = _pid_step_responses(num, den, gains, T)
+    out = np.empty(len(gains), dtype=METRICS_DTYPE)
+    out["Kp"], out["Ki"], out["Kd"] = gains.T
+    out["stable"] = stable
+    for name, values in step_metrics(T, Y).items():
+        out[name] = values
+    return out
+
+
+def sweep_pid_gains(num, den, Kp, Ki, Kd, grid=True, t_final=20.0, n_points=1000,
+                    n_jobs=None, chunk_size=256, keep_best=0, objective="IAE"):
+    """
+    Balayage de gains PID réparti sur plusieurs processus
+
+    Kp, Ki, Kd : valeurs à combiner en grille (grid=True) ou échantillons de même longueur (grid=False)
+    n_jobs : nombre de processus (1 : exécution dans le processus courant)
+    chunk_size : nombre de candidats évalués par tâche
+    keep_best : nombre de meilleurs candidats (selon `objective`) dont on conserve la réponse temporelle
+
+    Retourne un dict :
+        metrics : tableau structuré (gains, stabilité, temps de montée, dépassement,
+                  temps d'établissement, IAE, ISE)
+        best : liste des meilleurs candidats avec leurs réponses (t, y)
+    """
+    if grid:
+        mesh = np.meshgrid(np.atleast_1d(Kp), np.atleast_1d(Ki), np.atleast_1d(Kd), indexing='ij')
+        gains = np.stack([m.ravel() for m in mesh], axis=1).astype(float)
+    else:
+        gains = np.column_stack(np.broadcast_arrays(Kp, Ki, Kd)).astype(float)
+
+    T = np.linspace(0, t_final, n_points)
+    chunks = [gains[i:i + chunk_size] for i in range(0, len(gains), chunk_size)]
+    args = ([num] * len(chunks), [den] * len(chunks), chunks, [T] * len(chunks))
+
+    if n_jobs == 1:
+        parts = list(map(_evaluate_gain_chunk, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            parts = list(executor.map(_evaluate_gain_chunk, *args))
+    metrics = np.concatenate(parts)
+
+    best = []
+    if keep_best:
+        score = np.where(metrics["stable"], metrics[objective], np.inf)
+        order = np.argsort(score, kind="stable")[:keep_best]
+        Y, _ = _pid_step_responses(num, den, gains[order], T)
+        best = [{"Kp": gains[k, 0], "Ki": gains[k, 1], "Kd": gains[k, 2],
+                 objective: metrics[objective][k], "t": T, "y": y}
+                for k, y in zip(order, Y)]
+
+    return {"metrics": metrics, "best": best}
+
+
+def _autotune_cost(num, den, gains, T, objective, constraints, penalty):
+    """
+    Coût de chaque jeu de gains (N, 3) : critère temporel + pénalités sur les contraintes
+    (dépassement, marges de gain et de phase, pic de sensibilité) ; inf si instable
+    """
+    Y, stable = _pid_step_responses(num, den, gains, T)
+    metrics = step_metrics(T, Y)
+    margins = pid_stability_margins(num, den, gains[:, 0], gains[:, 1], gains[:, 2])
+
+    violations = np.zeros(len(gains))
+    if constraints.get("max_overshoot") is not None:
+        violations += (np.maximum(0.0, metrics["overshoot"] - constraints["max_overshoot"])
+                       / max(constraints["max_overshoot"], 1.0)) ** 2
+    if constraints.get("min_phase_margin") is not None:
+        violations += (np.maximum(0.0, constraints["min_phase_margin"] - margins["phase_margin"])
+                       / constraints["min_phase_margin"]) ** 2
+    if constraints.get("min_gain_margin") is not None:
+        gm_db = 20 * np.log10(margins["gain_margin"])
+        violations += (np.maximum(0.0, constraints["min_gain_margin"] - gm_db)
+                       / constraints["min_gain_margin"]) ** 2
+    if constraints.get("max_sensitivity") is not None:
+        violations += (np.maximum(0.0, margins["peak_sensitivity"] - constraints["max_sensitivity"])
+                       / constraints["max_sensitivity"]) ** 2
+
+    cost = metrics[objective] + penalty * violations
+    return np.where(stable & np.isfinite(cost), cost, np.inf), metrics, margins
+
+
+def autotune_pid_gains(num, den, objective="ISE", max_overshoot=None, min_phase_margin=None,
+                       min_gain_margin=None, max_sensitivity=None, penalty=10.0, t_final=None,
+                       n_points=500, span=1.5, popsize=16, max_generations=60, time_budget=None,
+                       patience=10, tol=1e-4, seed=None):
+    """
+    Réglage automatique d'un PID par optimisation sans gradient (évolution différentielle)
+
+    1. Ku et Tu sont lus sur la réponse fréquentielle du procédé ; les gains de Ziegler-Nichols
+       servent de centre à l'espace de recherche (log10 des gains, ± span décades).
+       Sans passage à -180°, le centre est déduit de la pulsation moyenne des pôles.
+    2. Coût : objective ("ISE", "IAE" ou "ITAE") + penalty × violations² des contraintes
+       max_overshoot (%), min_phase_margin (°), min_gain_margin (dB), max_sensitivity (Ms).
+    3. Chaque génération est évaluée en un seul appel vectorisé (réponses indicielles et marges).
+
+    Arrêt : max_generations, time_budget (s), ou absence d'amélioration relative > tol
+    pendant `patience` générations.
+
+    Retourne un dict : Kp, Ki, Kd, cost, metrics, margins, Ku, Tu, n_evaluations,
+    n_generations, elapsed, stop_reason, history (meilleur coût par génération)
+    """
+    start = time.perf_counter()
+    num = np.trim_zeros(np.atleast_1d(np.asarray(num, dtype=float)), 'f')
+    den = np.trim_zeros(np.atleast_1d(np.asarray(den, dtype=float)), 'f')
+    if num.size > den.size:
+        raise ValueError("Le procédé doit être propre.")
+    # Avec un procédé bipropre, une action dérivée rendrait la boucle fermée impropre
+    use_derivative = num.size < den.size
+
+    margins = stability_margins(num, den)
+    Ku, w_pc = margins["gain_margin"], margins["phase_crossover"]
+    if np.isfinite(Ku):
+        Tu = 2 * np.pi / w_pc
+        center = np.array([0.6 * Ku, 1.2 * Ku / Tu, 0.075 * Ku * Tu])
+        w0 = w_pc
+    else:
+        Tu = np.nan
+        breaks = np.abs(np.roots(den))
+        breaks = breaks[breaks > 1e-12]
+        w0 = np.exp(np.log(breaks).mean()) if breaks.size else 1.0
+        K0 = 1.0 / max(np.abs(np.polyval(num, 1j * w0) / np.polyval(den, 1j * w0)), 1e-12)
+        center = np.array([K0, K0 * w0 / 2, K0 / (4 * w0)])
+    if t_final is None:
+        t_final = 10 * Tu if np.isfinite(Tu) else 20 / w0
+    T = np.linspace(0, t_final, n_points)
+
+    constraints = {"max_overshoot": max_overshoot, "min_phase_margin": min_phase_margin,
+                   "min_gain_margin": min_gain_margin, "max_sensitivity": max_sensitivity}
+    dims = 3 if use_derivative else 2
+    log_center = np.log10(center[:dims])
+    bounds = [(c - span, c + span) for c in log_center]
+
+    def to_gains(x):
+        gains = np.zeros((x.shape[1], 3))
+        gains[:, :dims] = 10.0 ** x.T
+        return gains
+
+    history = []
+    state = {"evaluations": 0, "best": np.inf, "stop_reason": "max_generations"}
+
+    def cost(x):
+        x = np.atleast_2d(x.T).T                 # (dims, S)
+        state["evaluations"] += x.shape[1]
+        J, _, _ = _autotune_cost(num, den, to_gains(x), T, objective, constraints, penalty)
+        state["best"] = min(state["best"], J.min())
+        # L'évolution différentielle n'accepte pas inf : grand coût fini à la place
+        return np.where(np.isfinite(J), J, 1e12)
+
+    def callback(xk, convergence=None):
+        best = state["best"]
+        history.append(best)
+        if time_budget is not None and time.perf_counter() - start > time_budget:
+            state["stop_reason"] = "time_budget"
+            return True
+        if len(history) > patience and history[-patience - 1] - best <= tol * abs(history[-patience - 1]):
+            state["stop_reason"] = "no_improvement"
+            return True
+        return False
+
+    result = differential_evolution(cost, bounds, x0=log_center, popsize=popsize, maxiter=max_generations,
+                                    tol=0, polish=False, vectorized=True, updating='deferred',
+                                    callback=callback, rng=seed)
+
+    best_gains = to_gains(result.x[:, None])
+    J, metrics, best_margins = _autotune_cost(num, den, best_gains, T, objective, constraints, penalty)
+    return {
+        "Kp": best_gains[0, 0], "Ki": best_gains[0, 1], "Kd": best_gains[0, 2],
+        "cost": J[0],
+        "metrics": {name: values[0] for name, values in metrics.items()},
+        "margins": {name: best_margins[name][0] for name, _ in best_margins.dtype.descr},
+        "Ku": Ku, "Tu": Tu,
+        "n_evaluations": state["evaluations"],
+        "n_generations": len(history),
+        "elapsed": time.perf_counter() - start,
+        "stop_reason": state["stop_reason"],
+        "history": np.array(history),
+    }
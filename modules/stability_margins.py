@@ -0,0 +1,228 @@
+"""
+Marges de stabilité d'une boucle ouverte L(s) = N(s)/D(s) par recherche de racines :
+sur s = jω, N et D s'écrivent Nr(ω) + j Ni(ω), Dr(ω) + j Di(ω) (polynômes réels en ω), d'où
+- pulsations de coupure (|L| = 1)      : Nr² + Ni² - Dr² - Di² = 0
+- pulsations de phase -180° (L réel < 0) : Ni Dr - Nr Di = 0
+- pic de sensibilité Ms = max |S|, S = D/(D + N) : points stationnaires de |D|²/|D + N|²
+Aucun balayage fréquentiel : les racines sont exactes à la précision machine.
+
+Les polynômes sont manipulés par lots (une ligne de coefficients par boucle ouverte) :
+les racines de tout un lot sont obtenues par un seul appel à eigvals sur les matrices
+compagnes empilées.
+"""
+
+import numpy as np
+
+MARGINS_DTYPE = [("gain_margin", float), ("phase_margin", float), ("delay_margin", float),
+                 ("peak_sensitivity", float), ("gain_crossover", float), ("phase_crossover", float)]
+
+
+def _pad(p, size):
+    return np.concatenate([np.zeros(p.shape[:-1] + (size - p.shape[-1],), dtype=p.dtype), p], axis=-1)
+
+
+def _padd(a, b):
+    size = max(a.shape[-1], b.shape[-1])
+    return _pad(a, size) + _pad(b, size)
+
+
+def _pmul(a, b):
+    """
+    Produit ligne à ligne de deux lots de polynômes (N, la) et (N, lb)
+    """
+    out = np.zeros((a.shape[0], a.shape[1] + b.shape[1] - 1), dtype=np.result_type(a, b))
+    for i in range(a.shape[1]):
+        out[:, i:i + b.shape[1]] += a[:, i:i + 1] * b
+    return out
+
+
+def _pder(p):
+    d = p.shape[1] - 1
+    return p[:, :-1] * np.arange(d, 0, -1) if d > 0 else np.zeros_like(p)
+
+
+def _pval(p, x):
+    """
+    Évalue chaque polynôme p (N, k) en ses points x (N, K) (Horner)
+    """
+    v = np.zeros(x.shape, dtype=np.result_type(p, x))
+    for k in range(p.shape[1]):
+        v = v * x + p[:, k:k + 1]
+    return v
+
+
+def _on_imaginary_axis(p):
+    """
+    Parties réelle et imaginaire de p(jω), comme polynômes réels en ω
+    """
+    c = p * (1j) ** np.arange(p.shape[1] - 1, -1, -1)
+    return c.real, c.imag
+
+
+def _leading_index(p):
+    # Indice du premier coefficient non négligeable de chaque ligne
+    scale = np.abs(p).max(axis=1, keepdims=True)
+    significant = np.abs(p) > 1e-14 * scale
+    return np.where(significant.any(axis=1), significant.argmax(axis=1), p.shape[1] - 1)
+
+
+def _positive_real_roots(p):
+    """
+    Racines réelles strictement positives de chaque ligne de p (N, k), affinées par Newton
+    Retourne (N, k-1), complété par nan
+    """
+    N, k = p.shape
+    roots = np.full((N, max(k - 1, 0)), np.nan)
+    lead = _leading_index(p)
+    for i in np.unique(lead):
+        rows = np.flatnonzero(lead == i)
+        q = p[rows, i:]
+        d = q.shape[1] - 1
+        if d < 1:
+            continue
+        # Matrices compagnes empilées : une seule décomposition pour tout le groupe
+        companion = np.zeros((rows.size, d, d))
+        companion[:, 0, :] = -q[:, 1:] / q[:, :1]
+        companion[:, np.arange(1, d), np.arange(d - 1)] = 1.0
+        r = np.linalg.eigvals(companion)
+        real = (np.abs(r.imag) <= 1e-7 * np.maximum(1.0, np.abs(r))) & (r.real > 1e-12)
+        roots[rows, :d] = np.where(real, r.real, np.nan)
+
+    dp = _pder(p)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for _ in range(2):
+            d = _pval(dp, roots)
+            roots = roots - np.where(d != 0, _pval(p, roots) / d, 0.0)
+    return roots
+
+
+def _nan_select(values, key):
+    """
+    Pour chaque ligne, valeur de `values` à l'indice minimisant `key` (nan ignorés)
+    Retourne (valeurs, masque des lignes sans candidat)
+    """
+    key = np.where(np.isnan(key), np.inf, key)
+    k = key.argmin(axis=1)
+    empty = ~np.isfinite(key[np.arange(key.shape[0]), k]) if key.shape[1] else np.ones(key.shape[0], bool)
+    selected = values[np.arange(values.shape[0]), k] if values.shape[1] else np.full(values.shape[0], np.nan)
+    return selected, empty
+
+
+def _trailing_zeros(p):
+    # Nombre de coefficients constants nuls de chaque ligne (ordre de la racine en s = 0)
+    nonzero = p[:, ::-1] != 0
+    return np.where(nonzero.any(axis=1), nonzero.argmax(axis=1), p.shape[1])
+
+
+def cancel_origin(num, den):
+    """
+    Simplifie num/den par la plus grande puissance de s commune (ex : PD dont le facteur s
+    de l'intégrateur n'est compensé par aucun Ki) ; coefficients 1D ou lots (N, k)
+    Les lots gardent leur largeur (zéros de tête), les polynômes 1D sont raccourcis.
+    """
+    num, den = np.asarray(num, dtype=float), np.asarray(den, dtype=float)
+    if num.ndim == 1:
+        k = int(min(_trailing_zeros(num[None])[0], _trailing_zeros(den[None])[0], den.size - 1))
+        return (num[:num.size - k] if k else num), (den[:den.size - k] if k else den)
+    k = np.minimum(_trailing_zeros(num), _trailing_zeros(den))
+    k = np.minimum(k, den.shape[1] - 1)
+    if not k.any():
+        return num, den
+    num, den = num.copy(), den.copy()
+    for shift in np.unique(k[k > 0]):
+        rows = k == shift
+        num[rows] = np.concatenate([np.zeros((rows.sum(), shift)), num[rows, :-shift]], axis=1)
+        den[rows] = np.concatenate([np.zeros((rows.sum(), shift)), den[rows, :-shift]], axis=1)
+    return num, den
+
+
+def margins_batch(num, den):
+    """
+    Marges de stabilité d'un lot de boucles ouvertes num (N, kn) / den (N, kd)
+    Les racines communes en s = 0 sont d'abord simplifiées (cancel_origin).
+    Retourne un tableau structuré (N,) de type MARGINS_DTYPE
+    """
+    num, den = cancel_origin(np.asarray(num, dtype=float), np.asarray(den, dtype=float))
+    Nr, Ni = _on_imaginary_axis(num)
+    Dr, Di = _on_imaginary_axis(den)
+    N2 = _padd(_pmul(Nr, Nr), _pmul(Ni, Ni))
+    D2 = _padd(_pmul(Dr, Dr), _pmul(Di, Di))
+    out = np.empty(num.shape[0], dtype=MARGINS_DTYPE)
+
+    def L(w):
+        s = 1j * w
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return _pval(num, s) / _pval(den, s)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Marge de phase (la plus faible) et marge de retard aux pulsations de coupure
+        w_gc = _positive_real_roots(_padd(N2, -D2))
+        pm = np.angle(-L(w_gc))
+        pm[np.isnan(w_gc)] = np.nan
+        pm_sel, no_gc = _nan_select(pm, pm)
+        w_sel, _ = _nan_select(w_gc, pm)
+        out["phase_margin"] = np.where(no_gc, np.inf, np.degrees(pm_sel))
+        out["gain_crossover"] = np.where(no_gc, np.nan, w_sel)
+        delay = np.mod(pm, 2 * np.pi) / w_gc
+        out["delay_margin"] = np.where(no_gc, np.inf, np.fmin.reduce(delay, axis=1, initial=np.inf))
+
+        # Marge de gain (la plus proche de 1) aux passages par -180° (L réel négatif),
+        # y compris ω = 0 quand L(0) est fini (L(0) est alors réel)
+        w_pc = _positive_real_roots(_padd(_pmul(Ni, Dr), -_pmul(Nr, Di)))
+        w_zero = np.where(den[:, -1:] != 0, 0.0, np.nan)
+        w_pc = np.hstack([w_zero, w_pc])
+        L_pc = L(w_pc)
+        w_pc[~(L_pc.real < 0)] = np.nan
+        gm = 1.0 / np.abs(L_pc)
+        gm[np.isnan(w_pc)] = np.nan
+        gm_sel, no_pc = _nan_select(gm, np.abs(np.log(gm)))
+        w_sel, _ = _nan_select(w_pc, np.abs(np.log(gm)))
+        out["gain_margin"] = np.where(no_pc, np.inf, gm_sel)
+        out["phase_crossover"] = np.where(no_pc, np.nan, w_sel)
+
+        # Pic de sensibilité : ω = 0, points stationnaires de P/Q (P = |D|², Q = |D + N|²) et ω → ∞
+        closed = _padd(den, num)
+        Sr, Si = _on_imaginary_axis(closed)
+        Q = _padd(_pmul(Sr, Sr), _pmul(Si, Si))
+        P = _pad(D2, Q.shape[1]) if D2.shape[1] < Q.shape[1] else D2
+        Q = _pad(Q, P.shape[1])
+        stationary = _positive_real_roots(_padd(_pmul(_pder(P), Q), -_pmul(P, _pder(Q))))
+        w = np.hstack([np.zeros((num.shape[0], 1)), stationary])
+        S = np.abs(_pval(den, 1j * w) / _pval(closed, 1j * w))
+        S[np.isnan(w)] = np.nan
+        S[np.isnan(S) & ~np.isnan(w)] = np.inf
+
+        lead_P, lead_Q = _leading_index(P), _leading_index(Q)
+        rows = np.arange(num.shape[0])
+        S_inf = np.where(lead_P == lead_Q, np.sqrt(np.abs(P[rows, lead_P] / Q[rows, lead_Q])),
+                         np.where(lead_P < lead_Q, np.inf, 0.0))
+        out["peak_sensitivity"] = np.fmax(np.fmax.reduce(S, axis=1, initial=0.0), S_inf)
+    return out
+
+
+def stability_margins(num, den):
+    """
+    Marges de stabilité de la boucle ouverte L = num/den
+
+    Retourne un dict :
+        gain_margin : marge de gain (linéaire, inf si pas de phase -180°)
+        phase_margin : marge de phase (degrés, inf si pas de coupure)
+        delay_margin : retard pur maximal toléré (s)
+        peak_sensitivity : Ms = max |1/(1 + L(jω))|
+        gain_crossover, phase_crossover : pulsations correspondantes (nan si absentes)
+    """
+    result = margins_batch(np.atleast_2d(np.asarray(num, dtype=float)), np.atleast_2d(np.asarray(den, dtype=float)))
+    return {name: result[name][0] for name, _ in MARGINS_DTYPE}
+
+
+def pid_stability_margins(num, den, Kp, Ki, Kd):
+    """
+    Marges de stabilité de la boucle PID·G pour un lot de gains (Kp, Ki, Kd diffusés ensemble)
+    L(s) = (Kd s² + Kp s + Ki)·num / (s·den), le facteur s étant simplifié pour les gains Ki = 0
+    Retourne un tableau structuré (N,) de type MARGINS_DTYPE
+    """
+    Kp, Ki, Kd = (np.ravel(g).astype(float) for g in np.broadcast_arrays(Kp, Ki, Kd))
+    gains = np.column_stack([Kd, Kp, Ki])
+    num = np.broadcast_to(np.atleast_1d(np.asarray(num, dtype=float)), (gains.shape[0], np.size(num)))
+    den_ol = np.broadcast_to(np.polymul([1.0, 0.0], den), (gains.shape[0], np.size(den) + 1))
+    return margins_batch(_pmul(gains, num), den_ol)
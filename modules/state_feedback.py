@@ -1,6 +1,128 @@
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from scipy.linalg import lu_factor, lu_solve
 from scipy.signal import place_poles
-from scipy.integrate import solve_ivp
+from modules.controllability import krylov_matrix
+from modules.lti_propagation import simulate_linear
+
+PLACEMENT_DTYPE = [("cond", float), ("gain_norm", float), ("placement_error", float), ("method", "U11"),
+                   ("error", "U120")]
+# Ackermann : conditionnement maximal de Wc et écart relatif toléré sur les pôles obtenus
+_ACKERMANN_MAX_COND = 1e6
+_ACKERMANN_RTOL = 1e-8
+
+def initial_conditions_grid(bounds, points):
+    """
+    Génère une grille régulière d'états initiaux
+    bounds : liste de couples (min, max), un par composante d'état
+    points : nombre de points par axe (entier ou liste)
+    Retourne un tableau (N, n)
+    """
+    points = np.broadcast_to(points, (len(bounds),))
+    axes = [np.linspace(lo, hi, int(k)) for (lo, hi), k in zip(bounds, points)]
+    mesh = np.meshgrid(*axes, indexing='ij')
+    return np.stack([m.ravel() for m in mesh], axis=1)
+
+
+def characteristic_coefficients(poles):
+    """
+    Coefficients [1, a1, ..., an] des polynômes caractéristiques d'un lot de jeux de pôles (N, n)
+    """
+    poles = np.atleast_2d(np.asarray(poles, dtype=complex))
+    c = np.ones((poles.shape[0], 1), dtype=complex)
+    for k in range(poles.shape[1]):
+        c = np.hstack((c, np.zeros((c.shape[0], 1)))) - poles[:, k:k + 1] * np.hstack((np.zeros((c.shape[0], 1)), c))
+    if np.any(np.abs(c.imag) > 1e-8 * np.maximum(np.abs(c.real), 1.0)):
+        raise ValueError("Les pôles complexes doivent apparaître par paires conjuguées.")
+    return c.real
+
+
+def _place_poles_chunk(A, B, poles):
+    """
+    Placement individuel (cas multi-entrées ou repli) d'un bloc de jeux de pôles par
+    scipy.signal.place_poles ; un échec (pôle répété plus de rang(B) fois, paire non
+    contrôlable...) ne concerne que son jeu de pôles : gain NaN et message d'erreur
+    """
+    K = np.full((len(poles), B.shape[1], A.shape[0]), np.nan)
+    errors = [""] * len(poles)
+    for i, p in enumerate(poles):
+        try:
+            K[i] = place_poles(A, B, p).gain_matrix
+        except (ValueError, np.linalg.LinAlgError) as exc:
+            errors[i] = str(exc)
+    return K, errors
+
+
+def place_poles_batch(A, B, poles, n_jobs=1, chunk_size=64):
+    """
+    Placement de pôles pour un lot de jeux de pôles (N, n) sur une même paire (A, B)
+
+    Entrée unique : la matrice de Krylov est factorisée une seule fois, q = e_nᵀ Wc⁻¹,
+    puis les lignes q Aᵏ sont réutilisées (formule d'Ackermann) : K = Σ a_k q A^{n-k},
+    soit un seul produit matriciel pour tout le lot. Chaque gain est vérifié (pôles obtenus) ;
+    les jeux mal placés, ou tous si Wc est mal conditionnée, passent par le chemin général.
+    Chemin général : scipy.signal.place_poles pour chaque jeu, réparti sur n_jobs processus.
+    Un jeu de pôles impossible à placer n'interrompt pas le lot : son gain vaut NaN et
+    l'échec est signalé dans metrics.
+
+    Retourne un dict :
+        K : gains empilés (N, m, n)
+        metrics : tableau structuré (N,) de champs
+            cond : conditionnement de la matrice des vecteurs propres de A - BK (robustesse)
+            gain_norm : norme de Frobenius de K
+            placement_error : écart maximal entre pôles obtenus et pôles désirés
+            method : 'ackermann', 'place_poles' (chemin effectivement utilisé) ou 'failed'
+            error : message d'erreur du placement ('' si réussi)
+    """
+    A = np.asarray(A, dtype=float)
+    B = np.asarray(B, dtype=float)
+    poles = np.atleast_2d(np.asarray(poles, dtype=complex))
+    n, m = B.shape
+
+    K = np.empty((len(poles), m, n))
+    method = np.full(len(poles), 'place_poles', dtype=PLACEMENT_DTYPE[3][1])
+    errors = np.full(len(poles), '', dtype=PLACEMENT_DTYPE[4][1])
+    if m == 1:
+        Wc = krylov_matrix(A, B)
+        # Ackermann perd environ log10(cond(Wc)) chiffres : réservé aux Wc bien conditionnées
+        if np.linalg.cond(Wc) < _ACKERMANN_MAX_COND:
+            e_n = np.zeros(n)
+            e_n[-1] = 1.0
+            R = np.empty((n + 1, n))
+            R[0] = lu_solve(lu_factor(Wc), e_n, trans=1)
+            for k in range(n):
+                R[k + 1] = R[k] @ A
+            K[:] = (characteristic_coefficients(poles) @ R[::-1])[:, None, :]
+            method[:] = 'ackermann'
+            achieved = np.linalg.eigvals(A - B @ K)
+            error = np.abs(achieved[:, :, None] - poles[:, None, :]).min(axis=1).max(axis=1)
+            method[error > _ACKERMANN_RTOL * np.maximum(np.abs(poles).max(axis=1), 1.0)] = 'place_poles'
+
+    todo = np.flatnonzero(method == 'place_poles')
+    if todo.size:
+        chunks = [poles[todo[i:i + chunk_size]] for i in range(0, todo.size, chunk_size)]
+        args = ([A] * len(chunks), [B] * len(chunks), chunks)
+        if n_jobs == 1:
+            parts = list(map(_place_poles_chunk, *args))
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                parts = list(executor.map(_place_poles_chunk, *args))
+        K[todo] = np.concatenate([k for k, _ in parts])
+        errors[todo] = sum((e for _, e in parts), [])
+    failed = errors != ''
+    method[failed] = 'failed'
+
+    metrics = np.empty(len(K), dtype=PLACEMENT_DTYPE)
+    metrics["cond"] = metrics["placement_error"] = np.nan
+    ok = ~failed
+    achieved, V = np.linalg.eig(A - B @ K[ok])
+    metrics["cond"][ok] = np.linalg.cond(V)
+    metrics["placement_error"][ok] = np.abs(achieved[:, :, None] - poles[ok][:, None, :]).min(axis=1).max(axis=1)
+    metrics["gain_norm"] = np.linalg.norm(K, axis=(1, 2))
+    metrics["method"] = method
+    metrics["error"] = errors
+    return {"K": K, "metrics": metrics}
+
 
 class StateFeedbackController:
     def __init__(self, A, B):
@@ -16,32 +138,36 @@ class StateFeedbackController:
         self.K = result.gain_matrix
         return self.K
 
-    def simulate_open_loop(self, x0, t_span):
+    def compute_gain_batch(self, poles_batch, n_jobs=1):
+        """
+        Calcule les gains pour un lot de jeux de pôles (N, n) sans modifier self.K
+        Retourne un dict {"K": (N, m, n), "metrics": tableau structuré}
+        """
+        return place_poles_batch(self.A, self.B, poles_batch, n_jobs=n_jobs)
+
+    def simulate_open_loop(self, x0, t_span, method='exact'):
         """
         Simule le système en boucle ouverte (sans feedback)
         dx/dt = Ax + Bu avec u=0
+        method : 'exact' (exponentielle de matrice), 'rk4', 'euler_si', 'dopri5'
+                 ou méthode de solve_ivp (ex: 'RK45')
         """
-        def open_loop_dynamics(t, x):
-            return self.A @ x
-
-        sol = solve_ivp(open_loop_dynamics, t_span, x0, t_eval=np.linspace(t_span[0], t_span[1], 500))
-        return sol.t, sol.y
+        return simulate_linear(self.A, x0, t_span, method)
 
-    def simulate_closed_loop(self, x0, t_span):
+    def simulate_closed_loop(self, x0, t_span, method='exact'):
         """
         Simule le système en boucle fermée avec feedback u = -Kx
         dx/dt = (A - BK)x
         """
-        if not hasattr(self, 'K'):
-            raise ValueError("Gain K non défini. Appeler compute_gain() d'abord.")
-
-        A_cl = self.A - self.B @ self.K
+        return simulate_linear(self.get_closed_loop_matrix(), x0, t_span, method)
 
-        def closed_loop_dynamics(t, x):
-            return A_cl @ x
-
-        sol = solve_ivp(closed_loop_dynamics, t_span, x0, t_eval=np.linspace(t_span[0], t_span[1], 500))
-        return sol.t, sol.y
+    def simulate_closed_loop_batch(self, X0, t_span, method='exact'):
+        """
+        Simule la boucle fermée pour un lot d'états initiaux X0 (N, n)
+        Retourne t (T,) et les trajectoires (N, n, T)
+        """
+        X0 = np.atleast_2d(np.asarray(X0, dtype=float))
+        return simulate_linear(self.get_closed_loop_matrix(), X0, t_span, method)
 
     def get_closed_loop_matrix(self):
         """
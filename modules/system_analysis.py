@@ -1,12 +1,108 @@
 import numpy as np
+from collections.abc import Mapping
+from functools import cached_property
 from scipy.signal import ss2tf, impulse, step, bode
 from numpy.linalg import eigvals
 import matplotlib.pyplot as plt
 from control import ss
 import control
+from modules.frequency_response import system_frequency_response
+
+
+def _stability_chunk(A_stack):
+    """
+    Pôles d'une pile de matrices (N, n, n) -> (stable, abscisse spectrale, amortissements)
+    """
+    poles = np.linalg.eigvals(A_stack)
+    abscissa = poles.real.max(axis=1)
+    wn = np.abs(poles)
+    # ζ = -Re(λ)/|λ| ; un pôle à l'origine est compté comme non amorti (ζ = 0)
+    zeta = np.divide(-poles.real, wn, out=np.zeros_like(wn), where=wn > 0)
+    return abscissa < 0, abscissa, zeta
+
+
+def screen_stability(A_family, chunk_size=4096):
+    """
+    Criblage de stabilité d'une famille de matrices d'état, sans objet python-control
+    ni simulation.
+
+    A_family : tableau (N, n, n) ou itérable (générateur) de matrices (n, n)
+    chunk_size : nombre de matrices traitées par appel à eigvals pour un itérable
+
+    Retourne un tableau structuré (N,) de champs :
+        stable : bool
+        spectral_abscissa : max Re(λ)
+        min_damping : plus petit coefficient d'amortissement
+        damping : coefficients d'amortissement des n pôles
+    """
+    if isinstance(A_family, (np.ndarray, list, tuple)):
+        chunks = [np.asarray(A_family, dtype=float)]
+    else:
+        chunks = _stack_chunks(A_family, chunk_size)
+
+    results = []
+    for A_stack in chunks:
+        stable, abscissa, zeta = _stability_chunk(A_stack)
+        out = np.empty(len(A_stack), dtype=[("stable", bool),
+                                             ("spectral_abscissa", float),
+                                             ("min_damping", float),
+                                             ("damping", float, (A_stack.shape[1],))])
+        out["stable"] = stable
+        out["spectral_abscissa"] = abscissa
+        out["min_damping"] = zeta.min(axis=1)
+        out["damping"] = zeta
+        results.append(out)
+    if not results:
+        raise ValueError("Famille de matrices vide.")
+    return np.concatenate(results)
+
+
+def _stack_chunks(iterable, chunk_size):
+    chunk = []
+    for A in iterable:
+        chunk.append(np.asarray(A, dtype=float))
+        if len(chunk) == chunk_size:
+            yield np.stack(chunk)
+            chunk = []
+    if chunk:
+        yield np.stack(chunk)
+
+
+class _LazyAnalysis(Mapping):
+    """
+    Dictionnaire d'analyse dont chaque entrée n'est calculée qu'à la première lecture
+    """
+    _KEYS = {
+        "poles": lambda s: s.poles,
+        "stable": lambda s: s.stable,
+        "temps": lambda s: s.impulse_response[0],
+        "reponse": lambda s: s.impulse_response[1],
+        "frequence": lambda s: s.frequency_response[0],
+        "gain": lambda s: s.frequency_response[1],
+        "phase": lambda s: s.frequency_response[2],
+    }
+
+    def __init__(self, system):
+        self._system = system
+
+    def __getitem__(self, key):
+        return self._KEYS[key](self._system)
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self):
+        return len(self._KEYS)
+
 
 class StateSpaceSystem:
-    def __init__(self, A, B, C, D):
+    def __init__(self, A, B, C, D, impulse_points=None, frequency_points=500, frequency_range=None):
+        """
+        impulse_points : nombre de points de la réponse impulsionnelle (None : choix automatique)
+        frequency_points : nombre maximal de points de la grille fréquentielle adaptative
+        frequency_range : bornes (log10) de la plage de fréquences en rad/s
+                          (None : déduite des pôles du système)
+        """
         self.A = np.array(A, dtype=float)
         self.B = np.array(B, dtype=float)
         self.C = np.array(C, dtype=float)
@@ -15,36 +111,45 @@ class StateSpaceSystem:
         # Valide juste les dimensions ici
         self._check_dimensions()
 
-        # Crée le système après validation
-        self.system = ss(self.A, self.B, self.C, self.D)
+        self.impulse_points = impulse_points
+        self.frequency_points = frequency_points
+        self.frequency_range = frequency_range
 
-        # Calcule les propriétés
-        self.analysis = self._analyze_system()
+        # Les propriétés ne sont calculées qu'à la lecture
+        self.analysis = _LazyAnalysis(self)
 
     def _check_dimensions(self):
         n, m = self.A.shape[0], self.B.shape[1]
         p = self.C.shape[0]
-        
+
         assert self.A.shape == (n, n), "Matrice A doit être carrée"
         assert self.B.shape == (n, m), "Dimensions B incompatibles avec A"
         assert self.C.shape == (p, n), "Dimensions C incompatibles avec A"
         assert self.D.shape == (p, m), "Dimensions D incompatibles avec B/C"
 
-    def _analyze_system(self):
-        poles = control.poles(self.system)
-        est_stable = all(np.real(p) < 0 for p in poles)
+    @cached_property
+    def system(self):
+        return ss(self.A, self.B, self.C, self.D)
+
+    @cached_property
+    def poles(self):
+        return eigvals(self.A)
 
-        t, y = control.impulse_response(self.system)
-        omega = np.logspace(-2, 2, 500)  # plage de fréquences
-        mag, phase, omega = control.frequency_response(self.system, omega)
+    @cached_property
+    def stable(self):
+        return bool(np.all(np.real(self.poles) < 0))
 
+    @cached_property
+    def impulse_response(self):
+        """
+        Réponse impulsionnelle (t, y)
+        """
+        t, y = control.impulse_response(self.system, T_num=self.impulse_points)
+        return t, y
 
-        return {
-            "poles": poles,
-            "stable": est_stable,
-            "temps": t,
-            "reponse": y,
-            "frequence": omega,
-            "gain": mag,
-            "phase": phase
-        }
+    @cached_property
+    def frequency_response(self):
+        """
+        Réponse fréquentielle (omega, gain, phase)
+        """
+        return system_frequency_response(self.system, self.frequency_range, self.frequency_points)
@@ -2,31 +2,30 @@
 
 import matplotlib.pyplot as plt
 import numpy as np
-from control import frequency_response
+from modules.frequency_response import system_frequency_response
 
-def plot_bode(system, save_path=None):
+def plot_bode(system, save_path=None, frequency_range=None):
     """
     Trace et sauvegarde (optionnellement) le diagramme de Bode.
 
     Args:
         system (TransferFunction): système à analyser
         save_path (str): chemin d’enregistrement si souhaité
+        frequency_range (tuple): exposants log10 de la plage de fréquences
+                                 (None : déduite des pôles et zéros)
     """
-    # Fréquence log-spacée
-    omega = np.logspace(-2, 2, 1000)  # de 0.01 à 100 rad/s
-
-    # Calcul manuel de la réponse fréquentielle
-    _, mag, phase = frequency_response(system, omega)
+    # Réponse fréquentielle sur grille adaptative
+    omega, mag, phase = system_frequency_response(system, frequency_range)
 
     # Diagramme
     fig, (ax_mag, ax_phase) = plt.subplots(2, 1, figsize=(8, 6))
 
-    ax_mag.semilogx(omega, 20 * np.log10(abs(mag)))
+    ax_mag.semilogx(omega, 20 * np.log10(mag))
     ax_mag.set_title("Diagramme de Bode - Magnitude")
     ax_mag.set_ylabel("Gain (dB)")
     ax_mag.grid(True, which='both')
 
-    ax_phase.semilogx(omega, np.degrees(np.angle(phase)))
+    ax_phase.semilogx(omega, np.degrees(phase))
     ax_phase.set_title("Diagramme de Bode - Phase")
     ax_phase.set_ylabel("Phase (°)")
     ax_phase.set_xlabel("Fréquence (rad/s)")
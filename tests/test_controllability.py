@@ -0,0 +1,62 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.controllability import ControlObservabilityAnalyzer
+
+
+def _partially_controllable(rng, n, nc, m):
+    # Paire (A, B) triangulaire par blocs (sous-espace contrôlable de dimension nc connue),
+    # puis changement de base orthogonal
+    A = rng.standard_normal((n, n))
+    A[nc:, :nc] = 0.0
+    B = np.zeros((n, m))
+    B[:nc] = rng.standard_normal((nc, m))
+    Q, _ = np.linalg.qr(rng.standard_normal((n, n)))
+    return Q @ A @ Q.T, Q @ B
+
+
+@pytest.mark.parametrize("method", ["staircase", "pbh"])
+@pytest.mark.parametrize("m", [1, 2])
+def test_controllable_subspace_dimension_30_states(method, m):
+    rng = np.random.default_rng(m)
+    for _ in range(50):
+        A, B = _partially_controllable(rng, 30, 20, m)
+        analyzer = ControlObservabilityAnalyzer(A, B, np.ones((1, 30)), np.zeros((1, m)))
+        result = analyzer.controllable_subspace(method)
+        assert result["dimension"] == 20
+        assert len(result["uncontrollable_modes"]) == 10
+        assert not analyzer.is_controllable(method)
+
+
+@pytest.mark.parametrize("method", ["staircase", "pbh"])
+def test_repeated_uncontrollable_eigenvalue(method):
+    analyzer = ControlObservabilityAnalyzer(np.eye(2), [[1], [0]], [[1, 0]], [[0]])
+    assert analyzer.controllable_subspace(method)["dimension"] == 1
+    assert analyzer.observable_subspace(method)["dimension"] == 1
+
+
+@pytest.mark.parametrize("method", ["staircase", "pbh"])
+@pytest.mark.parametrize("m", [2, 5])
+def test_multi_input_wide_blocks(method, m):
+    # B plus large que n, ou blocs de la réduction plus larges que hauts
+    rng = np.random.default_rng(m)
+    A = rng.standard_normal((3, 3))
+    B = rng.standard_normal((3, m))
+    C = rng.standard_normal((m, 3))
+    analyzer = ControlObservabilityAnalyzer(A, B, C, np.zeros((m, m)))
+    assert analyzer.controllable_subspace(method)["dimension"] == 3
+    assert analyzer.observable_subspace(method)["dimension"] == 3
+    assert analyzer.is_controllable(method) and analyzer.is_observable(method)
+
+
+def test_multi_input_partially_controllable():
+    rng = np.random.default_rng(3)
+    A, B = _partially_controllable(rng, 6, 4, 2)
+    analyzer = ControlObservabilityAnalyzer(A, B, np.ones((1, 6)), np.zeros((1, 2)))
+    assert analyzer.controllable_subspace("staircase")["dimension"] == 4
+    assert analyzer.controllable_subspace("pbh")["dimension"] == 4
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import sympy as sp
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import expression_cache
+
+
+def test_hit_skips_sympy(monkeypatch):
+    x1, x2 = sp.symbols('x1 x2')
+    f = [x2, -x1 + (1 - x1**2) * x2]
+    expression_cache.clear_cache()
+    first = expression_cache.compile_lyapunov([x1, x2], f, "x1**2 + x2**2")
+    dynamics = expression_cache.compile_dynamics([x1, x2], f)
+
+    # Un appel déjà vu ne calcule ni clé canonique ni sympify
+    def fail(*args, **kwargs):
+        raise AssertionError("calcul SymPy sur un appel en cache")
+    monkeypatch.setattr(expression_cache, "canonical_key", fail)
+    monkeypatch.setattr(expression_cache.sp, "sympify", fail)
+    assert expression_cache.compile_lyapunov([x1, x2], list(f), "x1**2 + x2**2") is first
+    assert expression_cache.compile_dynamics((x1, x2), f) is dynamics
+
+
+def test_same_model_different_inputs_share_entry():
+    x1, x2 = sp.symbols('x1 x2')
+    expression_cache.clear_cache()
+    entry = expression_cache.compile_dynamics([x1, x2], [x2, -x1])
+    assert expression_cache.compile_dynamics([x1, x2], ["x2", "-x1"]) is entry
+    assert expression_cache.compile_dynamics(sp.Matrix([x1, x2]), [x2, -x1]) is entry
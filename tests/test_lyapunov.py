@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+import sympy as sp
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.nonlinear_analysis import NonlinearSystem
+
+x1, x2 = sp.symbols('x1 x2')
+BOX = [(-1.0, 1.0), (-1.0, 1.0)]
+
+
+def test_certified_stable_linear_system():
+    system = NonlinearSystem([x1, x2], [-x1 + x2, -x1 - x2])
+    result = system.verify_lyapunov(x1**2 + x2**2, BOX, resolution=51)
+    assert result["n_violations"] == 0
+    assert result["certified"]
+    # {V < 1} est le plus grand sous-niveau contenu dans la boîte
+    assert result["certified_level"] == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("sampling", ["grid", "sobol"])
+def test_no_certified_level_when_violations_reach_the_exclusion_ball(sampling):
+    # Van der Pol : dV/dt = 2 x2² (1 - x1²) ≥ 0 près de l'origine
+    system = NonlinearSystem([x1, x2], [x2, -x1 + (1 - x1**2) * x2])
+    result = system.verify_lyapunov(x1**2 + x2**2, BOX, sampling=sampling, resolution=101,
+                                    n_samples=2 ** 12, seed=0)
+    assert result["n_violations"] > 0
+    assert result["certified_level"] == 0.0
+    assert not result["certified"]
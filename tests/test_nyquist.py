@@ -0,0 +1,39 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.nyquist import nyquist_analysis, pid_nyquist_batch
+
+
+def test_stable_loop_without_integral():
+    # P et PD sur 1/(s² + 3s + 2) : boucle fermée stable, le facteur s de s·den est simplifié
+    result = pid_nyquist_batch([1.0], [1.0, 3.0, 2.0], [1.0, 2.0], 0.0, [0.0, 0.5])
+    assert result["stable"].all()
+    assert (result["closed_loop_rhp_poles"] == 0).all()
+    np.testing.assert_allclose(1.0 / result["min_distance"], [1.0555, 1.0051], atol=1e-4)
+
+
+def test_mixed_batch_keeps_order():
+    Kp, Ki, Kd = [1.0, 1.0, 2.0], [1.0, 0.0, 1.0], [0.0, 0.0, 0.5]
+    batch = pid_nyquist_batch([1.0], [1.0, 3.0, 2.0], Kp, Ki, Kd)
+    for i in range(3):
+        single = pid_nyquist_batch([1.0], [1.0, 3.0, 2.0], Kp[i], Ki[i], Kd[i])[0]
+        assert batch[i]["stable"] == single["stable"]
+        assert batch[i]["min_distance"] == pytest.approx(single["min_distance"])
+
+
+def test_unstable_open_loop():
+    # 1/(s - 1) : stable en boucle fermée pour Kp > 1 (un tour anti-horaire autour de -1)
+    result = pid_nyquist_batch([1.0], [1.0, -1.0], [2.0, 0.5], 0.0, 0.0)
+    np.testing.assert_array_equal(result["open_loop_rhp_poles"], [1, 1])
+    np.testing.assert_array_equal(result["stable"], [True, False])
+
+
+def test_analysis_cancels_origin_factor():
+    analysis = nyquist_analysis([1.0, 0.0], [1.0, 3.0, 2.0, 0.0])
+    assert analysis["stable"]
+    assert analysis["min_distance"] == pytest.approx(1.0 / 1.0555, abs=1e-4)
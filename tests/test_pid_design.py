@@ -0,0 +1,31 @@
+import os
+import sys
+
+import control as ctrl
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.pid_design import pid_step_response
+
+
+def test_step_response_matches_control():
+    T = np.linspace(0, 10, 501)
+    Y, stable = pid_step_response([1.0], [1.0, 3.0, 2.0], [2.0, 1.0], [1.0, 0.0], [0.5, 0.0], T)
+    assert stable.all()
+    for i, (Kp, Ki, Kd) in enumerate([(2.0, 1.0, 0.5), (1.0, 0.0, 0.0)]):
+        loop = ctrl.tf([Kd, Kp, Ki], [1, 0]) * ctrl.tf([1.0], [1.0, 3.0, 2.0])
+        _, y = ctrl.step_response(ctrl.feedback(loop, 1), T)
+        np.testing.assert_allclose(Y[i], y, atol=1e-8)
+
+
+def test_single_instant():
+    Y, _ = pid_step_response([1.0], [1.0, 3.0, 2.0], 1.0, 1.0, 0.0, [0.0])
+    np.testing.assert_array_equal(Y, [[0.0]])
+
+
+@pytest.mark.parametrize("T", [[], [1.0, 2.0, 3.0], [0.0, 0.1, 0.3], [0.0, -0.1, -0.2], [[0.0, 0.1]]])
+def test_invalid_time_grid(T):
+    with pytest.raises(ValueError):
+        pid_step_response([1.0], [1.0, 3.0, 2.0], 1.0, 1.0, 0.0, T)
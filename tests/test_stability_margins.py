@@ -0,0 +1,49 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.stability_margins import cancel_origin, pid_stability_margins, stability_margins
+from modules.pid_design import PIDModel
+
+
+def _peak_sensitivity(num, den):
+    # Référence par balayage fin de |1 / (1 + L(jω))|
+    w = np.logspace(-4, 4, 200001)
+    s = 1j * w
+    return np.max(np.abs(1.0 / (1.0 + np.polyval(num, s) / np.polyval(den, s))))
+
+
+def test_cancel_origin():
+    num, den = cancel_origin([0.0, 2.0, 1.0, 0.0], [1.0, 3.0, 2.0, 0.0])
+    np.testing.assert_array_equal(num, [0.0, 2.0, 1.0])
+    np.testing.assert_array_equal(den, [1.0, 3.0, 2.0])
+    # Intégrateur réel (Ki ≠ 0) : rien à simplifier
+    num, den = cancel_origin([[1.0, 2.0, 3.0], [0.0, 1.0, 0.0]], [[1.0, 1.0, 0.0], [1.0, 1.0, 0.0]])
+    np.testing.assert_array_equal(num, [[1.0, 2.0, 3.0], [0.0, 0.0, 1.0]])
+    np.testing.assert_array_equal(den, [[1.0, 1.0, 0.0], [0.0, 1.0, 1.0]])
+
+
+@pytest.mark.parametrize("Kp, Kd", [(1.0, 0.0), (2.0, 0.5), (10.0, 1.0)])
+def test_pid_margins_without_integral(Kp, Kd):
+    num, den = [1.0], [1.0, 3.0, 2.0]
+    result = pid_stability_margins(num, den, Kp, 0.0, Kd)[0]
+    assert np.isfinite(result["peak_sensitivity"])
+    assert result["peak_sensitivity"] == pytest.approx(_peak_sensitivity([Kd, Kp], den), rel=1e-4)
+
+
+def test_p_controller_peak_sensitivity():
+    model = PIDModel([1.0], [1.0, 3.0, 2.0])
+    model.set_pid_gains(1.0, 0.0, 0.0)
+    assert model.stability_margins()["peak_sensitivity"] == pytest.approx(1.0555, abs=1e-4)
+
+
+def test_phase_crossover_at_zero_frequency():
+    # L(0) = -1 : la phase vaut -180° dès ω = 0, GM = 1
+    assert stability_margins([1.0], [1.0, -1.0])["gain_margin"] == pytest.approx(1.0)
+    assert stability_margins([0.5], [1.0, -1.0])["gain_margin"] == pytest.approx(2.0)
+    # Intégrateur pur : L(0) infini, pas de passage par -180° en ω = 0
+    assert np.isinf(stability_margins([1.0], [1.0, 0.0])["gain_margin"])
@@ -0,0 +1,40 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.state_feedback import place_poles_batch
+
+
+def _check_placed(A, B, result, poles, rows):
+    for i in rows:
+        achieved = np.sort_complex(np.linalg.eigvals(A - B @ result["K"][i]))
+        np.testing.assert_allclose(achieved, np.sort_complex(np.asarray(poles[i], dtype=complex)), atol=1e-6)
+
+
+def test_single_input_batch_with_failure():
+    A = np.array([[0.0, 1.0], [-2.0, -3.0]])
+    B = np.array([[0.0], [1.0]])
+    poles = [[-1.0, -2.0], [-3.0, -3.0], [-1 + 1j, -1 - 1j]]
+    result = place_poles_batch(A, B, poles)
+    metrics = result["metrics"]
+    # Le jeu répété échoue seul, les autres sont placés
+    np.testing.assert_array_equal(metrics["method"], ["ackermann", "failed", "ackermann"])
+    assert metrics["error"][1] and not metrics["error"][0] and not metrics["error"][2]
+    assert np.isnan(result["K"][1]).all()
+    assert np.isnan(metrics["placement_error"][1])
+    _check_placed(A, B, result, poles, [0, 2])
+
+
+def test_multi_input_batch_with_failure():
+    rng = np.random.default_rng(0)
+    A = rng.standard_normal((6, 6))
+    B = rng.standard_normal((6, 2))
+    poles = np.array([[-1, -2, -3, -4, -5, -6],
+                      [-1, -1, -1, -2, -3, -4],
+                      [-1, -1, -2, -2, -3, -3]], dtype=float)
+    result = place_poles_batch(A, B, poles)
+    np.testing.assert_array_equal(result["metrics"]["method"], ["place_poles", "failed", "place_poles"])
+    _check_placed(A, B, result, poles, [0, 2])